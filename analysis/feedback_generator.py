@@ -2,16 +2,386 @@
 Simplified Feedback Generator for Sanskrit Voice Bot v2
 Uses Gemini directly for AI-powered feedback
 """
-try:
-    from google import genai
-    GENAI_AVAILABLE = True
-except ImportError:
-    genai = None
-    GENAI_AVAILABLE = False
-
-from typing import Dict, Any, Optional, List
+import atexit
+import bisect
+import functools
+import hashlib
+import itertools
+import json
+import logging
+import queue
+import random
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
 from core.config import AnalysisConfig
 
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying (timeouts, rate limits, transient server errors)
+_RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+# Section labels in plain-text Gemini responses, and leading bullets/numbering on tips
+_SECTION_RE = re.compile(r'^[ \t]*(FEEDBACK|MOTIVATION|TIPS):', re.MULTILINE)
+_BULLET_RE = re.compile(r'^[-•*\d.)\s]+')
+
+# Accepted learner levels; anything else is treated as a beginner
+_USER_LEVELS = {'beginner': 'beginner', 'intermediate': 'intermediate', 'advanced': 'advanced'}
+
+# Fallback (feedback, motivation, tips) per accuracy tier, from the lowest threshold up.
+# Tips double as the defaults when Gemini returns none.
+_FEEDBACK_TIERS = (
+    (float('-inf'), "Keep practicing! You achieved {accuracy:.1f}% accuracy. Focus on the highlighted words.",
+         "Every practice session brings improvement!",
+         ("Break the shloka into smaller parts", "Practice each word slowly", "Repeat multiple times")),
+    (70, "Good job! You achieved {accuracy:.1f}% accuracy. Keep refining your pronunciation.",
+         "You're making great progress!",
+         ("Listen to the original audio again", "Focus on words you missed")),
+    (90, "Excellent pronunciation! Your chanting is very accurate.",
+         "Outstanding work! You're mastering Sanskrit pronunciation.",
+         ("Try practicing at a faster pace", "Move on to more challenging shlokas")),
+)
+# Thresholds above the first tier, for bisecting an accuracy to its tier
+_FEEDBACK_TIER_THRESHOLDS = tuple(tier[0] for tier in _FEEDBACK_TIERS[1:])
+
+# Prompt templates, formatted per call instead of rebuilding f-strings.
+# Bump _PROMPT_VERSION whenever a template changes so cached feedback from
+# the old wording (including the on-disk cache) is no longer served.
+_PROMPT_VERSION = 'v5'
+
+_STUDENT_RESULTS_TMPL = """- Accuracy: {accuracy:.1f}%
+- Words correct: {correct}/{total}
+- Mispronounced words: {mispronounced}
+- Level: {level}"""
+
+_JSON_PROMPT_TMPL = """You are a supportive Sanskrit pronunciation coach.
+
+STUDENT RESULTS:
+{results}
+
+Respond with a JSON object with these keys:
+- "feedback": 2-3 sentences about their performance and specific areas to improve
+- "motivation": 2 encouraging sentences to keep them practicing
+- "tips": a list of 2-3 short tips about their oral positioning and breathing techniques
+
+Keep it concise and supportive."""
+
+# Structured output, so replies are parsed with json.loads instead of
+# scanning for FEEDBACK/MOTIVATION/TIPS labels.
+_FEEDBACK_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'feedback': {'type': 'STRING'},
+        'motivation': {'type': 'STRING'},
+        'tips': {'type': 'ARRAY', 'items': {'type': 'STRING'}}
+    },
+    'required': ['feedback', 'motivation', 'tips']
+}
+_JSON_CONFIG = {'response_mime_type': 'application/json', 'response_schema': _FEEDBACK_SCHEMA}
+
+
+@functools.lru_cache(maxsize=1)
+def _load_genai():
+    """Import the Gemini SDK on first use; it is slow to import and not needed until feedback is requested"""
+    try:
+        from google import genai
+    except ImportError:
+        return None
+    return genai
+
+
+@functools.lru_cache(maxsize=1)
+def _get_client(api_key: str, timeout_ms: int):
+    """Shared Gemini client so every FeedbackGenerator reuses one connection pool"""
+    return _load_genai().Client(api_key=api_key, http_options={'timeout': timeout_ms})
+
+
+def _feedback_tier(accuracy: float):
+    """Return the (threshold, feedback, motivation, tips) tier for an accuracy"""
+    # bisect_right counts the thresholds at or below accuracy, i.e. the tier index
+    return _FEEDBACK_TIERS[bisect.bisect_right(_FEEDBACK_TIER_THRESHOLDS, accuracy)]
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_word(word: str) -> str:
+    """NFC-normalize and strip a word; memoized because each cache layer keys on the same words"""
+    return unicodedata.normalize('NFC', word).strip()
+
+
+def _in_flight_wait_seconds() -> float:
+    """How long an identical request waits on an in-flight Gemini call"""
+    # The owner's worst case: every attempt times out, with the longest backoff between them
+    retries = AnalysisConfig.LLM_FEEDBACK_RETRY_LIMIT
+    return AnalysisConfig.LLM_TIMEOUT * (retries + 1) + sum(2 ** attempt for attempt in range(retries))
+
+
+def _normalize_user_level(user_level: Optional[str]) -> str:
+    """Map a user-supplied level onto one of the accepted levels"""
+    return _USER_LEVELS.get(user_level.strip().lower() if user_level else 'beginner', 'beginner')
+
+
+def simple_feedback(analysis_result: Dict[str, Any]) -> Dict[str, str]:
+    """Rule-based feedback used when Gemini is unavailable"""
+    accuracy = analysis_result.get('accuracy', 0)
+    _, feedback_template, motivation, tips = _feedback_tier(accuracy)
+    
+    return {
+        'feedback': feedback_template.format(accuracy=accuracy),
+        'motivation': motivation,
+        'practice_tips': list(tips)
+    }
+
+
+def default_tips(accuracy: float) -> List[str]:
+    """Default practice tips based on accuracy"""
+    return list(_feedback_tier(accuracy)[3])
+
+
+@dataclass(frozen=True)
+class _CachedFeedback:
+    """Immutable feedback record shared by the memory and on-disk caches"""
+    # Declared by hand: dataclass(slots=True) needs Python 3.10, and a slot
+    # cannot have a class-level default, so every field is passed explicitly
+    __slots__ = ('feedback', 'motivation', 'practice_tips')
+    
+    feedback: str
+    motivation: str
+    practice_tips: Tuple[str, ...]
+    
+    @classmethod
+    def from_feedback(cls, feedback: Dict[str, Any]) -> '_CachedFeedback':
+        return cls(
+            feedback=feedback.get('feedback', ''),
+            motivation=feedback.get('motivation', ''),
+            practice_tips=tuple(feedback.get('practice_tips', ()))
+        )
+    
+    def as_feedback(self) -> Dict[str, Any]:
+        """Return a fresh feedback dict callers are free to mutate"""
+        return {
+            'feedback': self.feedback,
+            'motivation': self.motivation,
+            'practice_tips': list(self.practice_tips)
+        }
+
+
+class _ResponseCache:
+    """Bounded LRU cache with a per-entry TTL for generated feedback"""
+    
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[_CachedFeedback]:
+        """Return the cached feedback, or None if missing/expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key: str, value: _CachedFeedback):
+        """Store feedback, evicting the least recently used entries when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class _DiskResponseCache:
+    """
+    SQLite-backed feedback cache that survives app restarts.
+    
+    Writes go through a queue drained by one background thread, so storing
+    feedback never blocks the request that produced it.
+    """
+    
+    def __init__(self, path: Path, ttl_seconds: float):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.available = True
+        self._write_queue = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS feedback_cache '
+                    '(key TEXT PRIMARY KEY, stored_at REAL NOT NULL, value TEXT NOT NULL)'
+                )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Feedback disk cache disabled: %s", e)
+            self.available = False
+    
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+    
+    def get(self, key: str) -> Optional[_CachedFeedback]:
+        """Return the stored feedback, or None if missing/expired"""
+        if not self.available:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    'SELECT value FROM feedback_cache WHERE key = ? AND stored_at >= ?',
+                    (key, time.time() - self.ttl_seconds)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Feedback disk cache read failed: %s", e)
+            return None
+        if row is None:
+            return None
+        try:
+            return _CachedFeedback.from_feedback(json.loads(row[0]))
+        except (ValueError, AttributeError):
+            return None
+    
+    def put(self, key: str, value: _CachedFeedback):
+        """Queue feedback for storage, replacing any previous entry for the key"""
+        if not self.available:
+            return
+        self._ensure_writer()
+        self._write_queue.put((key, time.time(), json.dumps(asdict(value), ensure_ascii=False)))
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait up to timeout seconds for queued writes to be stored; False if some are still pending"""
+        if timeout is None:
+            timeout = AnalysisConfig.FEEDBACK_DISK_CACHE_FLUSH_SECONDS
+        deadline = time.monotonic() + timeout
+        with self._write_queue.all_tasks_done:
+            while self._write_queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("Feedback disk cache flush timed out with %d writes pending",
+                                   self._write_queue.unfinished_tasks)
+                    return False
+                self._write_queue.all_tasks_done.wait(remaining)
+        return True
+    
+    def _ensure_writer(self):
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._writer_loop, name='feedback-cache-writer', daemon=True
+                )
+                self._writer.start()
+                atexit.register(self.flush)
+    
+    def _writer_loop(self):
+        try:
+            conn = self._connect()
+        except sqlite3.Error as e:
+            # Stop accepting writes; anything already queued is drained below
+            logger.warning("Feedback disk cache disabled: %s", e)
+            self.available = False
+            conn = None
+        while True:
+            row = self._write_queue.get()
+            try:
+                if conn is None:
+                    continue
+                with conn:
+                    conn.execute(
+                        'INSERT OR REPLACE INTO feedback_cache (key, stored_at, value) VALUES (?, ?, ?)',
+                        row
+                    )
+            except sqlite3.Error as e:
+                logger.warning("Feedback disk cache write failed: %s", e)
+            finally:
+                self._write_queue.task_done()
+
+
+class _SimilarFeedbackIndex:
+    """
+    Near-duplicate lookup for analyses that differ slightly.
+    
+    Entries are grouped by (level, accuracy bucket) and matched on the
+    Jaccard similarity of their mispronounced-word sets. A match returns the
+    Gemini feedback stored for the similar analysis; entries expire after the
+    same TTL as the exact cache.
+    """
+    
+    def __init__(self, max_entries: int, threshold: float, bucket_size: float, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.bucket_size = bucket_size
+        self.ttl_seconds = ttl_seconds
+        # Entries are stored per group so a lookup only scans its own group;
+        # _order keeps the LRU order across all groups for eviction
+        self._groups: Dict[tuple, OrderedDict] = {}
+        self._order = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _fingerprint(self, analysis_result: Dict[str, Any], user_level: str):
+        accuracy = analysis_result.get('accuracy', 0)
+        group = (_PROMPT_VERSION, user_level, int(accuracy // self.bucket_size))
+        words = frozenset(
+            _normalize_word(w.get('original', ''))
+            for w in analysis_result.get('incorrect_words', [])[:5]
+        )
+        return group, words
+    
+    def get(self, analysis_result: Dict[str, Any], user_level: str) -> Optional[_CachedFeedback]:
+        """Return the feedback stored for a similar enough analysis, or None"""
+        group, words = self._fingerprint(analysis_result, user_level)
+        now = time.monotonic()
+        with self._lock:
+            for key, (stored_at, _, _) in list(self._groups.get(group, {}).items()):
+                if now - stored_at > self.ttl_seconds:
+                    del self._order[key]
+                    self._remove(key, group)
+            entries = self._groups.get(group)
+            if not entries:
+                return None
+            for key, (_, entry_words, value) in entries.items():
+                union = words | entry_words
+                score = len(words & entry_words) / len(union) if union else 1.0
+                if score >= self.threshold:
+                    entries.move_to_end(key)
+                    self._order.move_to_end(key)
+                    return value
+        return None
+    
+    def put(self, key: str, analysis_result: Dict[str, Any], user_level: str, value: _CachedFeedback):
+        """Index feedback under its analysis fingerprint, evicting the oldest entries when full"""
+        group, words = self._fingerprint(analysis_result, user_level)
+        with self._lock:
+            previous_group = self._order.get(key)
+            if previous_group is not None and previous_group != group:
+                self._remove(key, previous_group)
+            entries = self._groups.setdefault(group, OrderedDict())
+            entries[key] = (time.monotonic(), words, value)
+            entries.move_to_end(key)
+            self._order[key] = group
+            self._order.move_to_end(key)
+            while len(self._order) > self.max_entries:
+                self._remove(*self._order.popitem(last=False))
+    
+    def _remove(self, key: str, group: tuple):
+        """Drop an entry from its group, discarding the group once it is empty"""
+        entries = self._groups[group]
+        del entries[key]
+        if not entries:
+            del self._groups[group]
+
 
 class FeedbackGenerator:
     """Simple feedback generator using Gemini LLM"""
@@ -20,129 +390,268 @@ class FeedbackGenerator:
         self.client = None
         self.model_name = None
         self.initialized = False
+        self._init_retry_at = 0.0  # Monotonic time before which a failed setup is not retried
+        self._init_lock = threading.Lock()
+        self._cache = _ResponseCache(
+            AnalysisConfig.FEEDBACK_CACHE_MAX_ENTRIES,
+            AnalysisConfig.FEEDBACK_CACHE_TTL_SECONDS
+        )
+        self._disk_cache = None
+        if AnalysisConfig.FEEDBACK_CACHE_ENABLED:
+            self._disk_cache = _DiskResponseCache(
+                AnalysisConfig.FEEDBACK_DISK_CACHE_PATH,
+                AnalysisConfig.FEEDBACK_DISK_CACHE_TTL_SECONDS
+            )
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._similar = _SimilarFeedbackIndex(
+            AnalysisConfig.SIMILAR_FEEDBACK_MAX_ENTRIES,
+            AnalysisConfig.SIMILAR_FEEDBACK_THRESHOLD,
+            AnalysisConfig.SIMILAR_FEEDBACK_ACCURACY_BUCKET,
+            AnalysisConfig.FEEDBACK_CACHE_TTL_SECONDS
+        )
+        # Gemini calls in progress, keyed by cache key, so identical concurrent
+        # requests (double clicks, Streamlit reruns) share a single call
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_lock = threading.Lock()
         self._try_initialize()
     
     def _try_initialize(self) -> bool:
-        """Initialize Gemini API"""
-        if not GENAI_AVAILABLE:
+        """Initialize Gemini API once; a failed setup is retried at most every LLM_INIT_RETRY_SECONDS"""
+        if self.initialized or time.monotonic() < self._init_retry_at:
+            return self.initialized
+        with self._init_lock:
+            if not self.initialized and time.monotonic() >= self._init_retry_at:
+                if not self._initialize_client():
+                    self._init_retry_at = time.monotonic() + AnalysisConfig.LLM_INIT_RETRY_SECONDS
+        return self.initialized
+    
+    def _initialize_client(self) -> bool:
+        """Set up the shared Gemini client; False if the SDK or API key is missing"""
+        if _load_genai() is None:
             return False
         try:
             if AnalysisConfig.GEMINI_API_KEY:
-                self.client = genai.Client(api_key=AnalysisConfig.GEMINI_API_KEY)
+                self.client = _get_client(AnalysisConfig.GEMINI_API_KEY, AnalysisConfig.LLM_TIMEOUT * 1000)
                 self.model_name = AnalysisConfig.GEMINI_MODEL
                 self.initialized = True
                 return True
         except Exception as e:
-            print(f"Error initializing Gemini: {e}")
+            logger.warning("Error initializing Gemini: %s", e)
         return False
     
     def generate_feedback(self, analysis_result: Dict[str, Any], user_level: str = "beginner") -> Optional[Dict[str, str]]:
         """Generate feedback based on pronunciation analysis"""
         
+        user_level = _normalize_user_level(user_level)
+        if self._skip_llm(analysis_result):
+            return simple_feedback(analysis_result)
         if not self.initialized and not self._try_initialize():
-            return self._simple_feedback(analysis_result)
+            return simple_feedback(analysis_result)
         
+        cache_key = self._cache_key(analysis_result, user_level)
+        cached = self._lookup_cached(cache_key, analysis_result, user_level)
+        if cached is not None:
+            return cached
+        
+        in_flight, owner = self._claim_in_flight(cache_key)
+        if not owner:
+            try:
+                feedback = in_flight.result(timeout=_in_flight_wait_seconds())
+            except Exception:
+                feedback = None
+            return self._shared_feedback(feedback, analysis_result)
+        
+        feedback = None
         try:
-            accuracy = analysis_result.get('accuracy', 0)
-            incorrect_words = analysis_result.get('incorrect_words', [])
-            total_words = analysis_result.get('total_count', 0)
-            correct_words = analysis_result.get('correct_count', 0)
-            
-            prompt = f"""You are a supportive Sanskrit pronunciation coach.
-
-STUDENT RESULTS:
-- Accuracy: {accuracy:.1f}%
-- Words correct: {correct_words}/{total_words}
-- Mispronounced words: {', '.join([w.get('original', '') for w in incorrect_words[:5]]) or 'None'}
-- Level: {user_level}
-
-Provide brief, encouraging feedback in this exact format:
-
-FEEDBACK: [2-3 sentences about their performance and specific areas to improve]
-
-MOTIVATION: [2 encouraging sentence to keep them practicing]
-
-TIPS: [2-3 lines about their oral positioning and breathing techniques]
-
-Keep it concise and supportive."""
-
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
+            response = self._generate_content(
+                contents=self._build_json_prompt(analysis_result, user_level),
+                config=_JSON_CONFIG
             )
             
-            if response and hasattr(response, 'text'):
-                return self._parse_response(response.text, accuracy)
+            text = self._response_text(response)
+            if text:
+                feedback = self._parse_json_response(text, analysis_result.get('accuracy', 0))
+                self._store_cached(cache_key, analysis_result, user_level, feedback)
             
         except Exception as e:
-            print(f"Gemini error: {e}")
+            logger.warning("Gemini error: %s", e)
+        finally:
+            self._release_in_flight(cache_key, in_flight, feedback)
         
-        return self._simple_feedback(analysis_result)
+        return feedback or simple_feedback(analysis_result)
     
-    def _parse_response(self, text: str, accuracy: float) -> Dict[str, str]:
-        """Parse Gemini response into structured feedback"""
-        feedback = "Great effort!"
-        motivation = "Keep practicing!"
-        tips = []
-        
-        lines = text.strip().split('\n')
-        current_section = None
+    def _generate_content(self, **kwargs) -> Any:
+        """Call Gemini, retrying transient errors with jittered exponential backoff"""
+        for attempt in range(AnalysisConfig.LLM_FEEDBACK_RETRY_LIMIT + 1):
+            start = time.perf_counter()
+            try:
+                response = self.client.models.generate_content(model=self.model_name, **kwargs)
+                logger.debug("Gemini call took %.3fs (attempt %d)", time.perf_counter() - start, attempt + 1)
+                return response
+            except Exception as e:
+                if attempt >= AnalysisConfig.LLM_FEEDBACK_RETRY_LIMIT or getattr(e, 'code', None) not in _RETRYABLE_STATUS:
+                    raise
+                time.sleep(random.uniform(0, 2 ** attempt))
+    
+    @staticmethod
+    def _response_text(response: Any) -> str:
+        """Extract the text of a Gemini response, or '' when there is none"""
+        return getattr(response, 'text', None) or ''
+    
+    def _claim_in_flight(self, cache_key: str) -> Tuple[Future, bool]:
+        """Return the Future for an identical call in progress, or register a new one (owner=True)"""
+        with self._in_flight_lock:
+            future = self._in_flight.get(cache_key)
+            if future is not None:
+                return future, False
+            future = self._in_flight[cache_key] = Future()
+            return future, True
+    
+    def _release_in_flight(self, cache_key: str, future: Future, feedback: Optional[Dict[str, str]]):
+        """Hand the owner's result (None on failure) to any waiters and unregister the call"""
+        with self._in_flight_lock:
+            self._in_flight.pop(cache_key, None)
+        if not future.done():
+            future.set_result(feedback)
+    
+    def _shared_feedback(self, feedback: Optional[Dict[str, str]], analysis_result: Dict[str, Any]) -> Dict[str, str]:
+        """Give a waiter its own copy of another call's feedback, or the fallback if it failed"""
+        if not feedback:
+            return simple_feedback(analysis_result)
+        return _CachedFeedback.from_feedback(feedback).as_feedback()
+    
+    def _lookup_cached(self, cache_key: str, analysis_result: Dict[str, Any], user_level: str) -> Optional[Dict[str, str]]:
+        """Check the exact caches (memory, then disk) first, then near-duplicate analyses"""
+        if not AnalysisConfig.FEEDBACK_CACHE_ENABLED:
+            return None
+        cached = self._cache.get(cache_key)
+        if cached is None and self._disk_cache is not None:
+            cached = self._disk_cache.get(cache_key)
+            if cached is not None:
+                self._cache.put(cache_key, cached)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached.as_feedback()
+        if AnalysisConfig.SIMILAR_FEEDBACK_ENABLED:
+            similar = self._similar.get(analysis_result, user_level)
+            if similar is not None:
+                self.cache_hits += 1
+                return similar.as_feedback()
+        self.cache_misses += 1
+        return None
+    
+    def _store_cached(self, cache_key: str, analysis_result: Dict[str, Any], user_level: str, feedback: Dict[str, str]):
+        """Record feedback in the exact, on-disk and near-duplicate caches"""
+        if not AnalysisConfig.FEEDBACK_CACHE_ENABLED:
+            return
+        record = _CachedFeedback.from_feedback(feedback)
+        self._cache.put(cache_key, record)
+        if self._disk_cache is not None:
+            self._disk_cache.put(cache_key, record)
+        if AnalysisConfig.SIMILAR_FEEDBACK_ENABLED:
+            self._similar.put(cache_key, analysis_result, user_level, record)
+    
+    def _skip_llm(self, analysis_result: Dict[str, Any]) -> bool:
+        """Near-perfect attempts get the rule-based feedback without a Gemini call"""
+        return (analysis_result.get('accuracy', 0) >= AnalysisConfig.SKIP_LLM_FEEDBACK_ACCURACY and
+                not analysis_result.get('incorrect_words'))
+    
+    def _cache_key(self, analysis_result: Dict[str, Any], user_level: str) -> str:
+        """Hash the canonicalized prompt inputs into a cache key"""
+        incorrect_words = analysis_result.get('incorrect_words', [])
+        key_data = json.dumps({
+            'version': _PROMPT_VERSION,
+            'level': user_level,
+            'accuracy': round(analysis_result.get('accuracy', 0), 1),
+            'correct': analysis_result.get('correct_count', 0),
+            'total': analysis_result.get('total_count', 0),
+            'incorrect': [
+                _normalize_word(w.get('original', ''))
+                for w in incorrect_words[:5]
+            ]
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(key_data.encode('utf-8')).hexdigest()
+    
+    def _format_student_results(self, analysis_result: Dict[str, Any], user_level: str) -> str:
+        """Format the per-student results block shared by the text and JSON prompts"""
+        incorrect_words = analysis_result.get('incorrect_words', [])
+        mispronounced = ', '.join(w.get('original', '') for w in itertools.islice(incorrect_words, 5))
         
-        for line in lines:
-            line = line.strip()
-            if line.startswith('FEEDBACK:'):
-                current_section = 'feedback'
-                feedback = line.replace('FEEDBACK:', '').strip()
-            elif line.startswith('MOTIVATION:'):
-                current_section = 'motivation'
-                motivation = line.replace('MOTIVATION:', '').strip()
-            elif line.startswith('TIPS:'):
-                current_section = 'tips'
-                # Check if tips are on the same line as TIPS:
-                tip_content = line.replace('TIPS:', '').strip()
-                if tip_content:
-                    tips.append(tip_content)
-            elif current_section == 'feedback' and line:
-                feedback += ' ' + line
-            elif current_section == 'motivation' and line:
-                motivation += ' ' + line
-            elif current_section == 'tips' and line:
-                # Accept any line format: bullets, numbers, or plain text
-                cleaned = line.lstrip('-•*0123456789.) ')
-                if cleaned:
-                    tips.append(cleaned)
+        return _STUDENT_RESULTS_TMPL.format(
+            accuracy=analysis_result.get('accuracy', 0),
+            correct=analysis_result.get('correct_count', 0),
+            total=analysis_result.get('total_count', 0),
+            mispronounced=mispronounced or 'None',
+            level=user_level
+        )
+    
+    def _build_json_prompt(self, analysis_result: Dict[str, Any], user_level: str) -> str:
+        """Build the coaching prompt for a structured (JSON) response"""
+        return _JSON_PROMPT_TMPL.format(results=self._format_student_results(analysis_result, user_level))
+    
+    def _parse_json_response(self, text: str, accuracy: float) -> Dict[str, str]:
+        """Parse a structured response, falling back to the labelled text format"""
+        try:
+            feedback = self._feedback_from_item(json.loads(text), accuracy)
+        except ValueError:
+            feedback = None
+        return feedback or self._parse_response(text, accuracy)
+    
+    def _feedback_from_item(self, item: Any, accuracy: float) -> Optional[Dict[str, str]]:
+        """Convert one JSON feedback object into structured feedback, or None if unusable"""
+        if not isinstance(item, dict) or not item.get('feedback'):
+            return None
         
+        raw_tips = item.get('tips') or []
+        if isinstance(raw_tips, str):
+            raw_tips = [raw_tips]
+        tips = [str(tip).strip() for tip in raw_tips if str(tip).strip()]
         return {
-            'feedback': feedback,
-            'motivation': motivation,
-            'practice_tips': tips if tips else self._default_tips(accuracy)
+            'feedback': str(item['feedback']).strip(),
+            'motivation': str(item.get('motivation') or 'Keep practicing!').strip(),
+            'practice_tips': tips if tips else default_tips(accuracy)
         }
     
-    def _simple_feedback(self, analysis_result: Dict[str, Any]) -> Dict[str, str]:
-        """Fallback feedback when Gemini unavailable"""
-        accuracy = analysis_result.get('accuracy', 0)
-        
-        if accuracy >= 90:
-            feedback = "Excellent pronunciation! Your chanting is very accurate."
-            motivation = "Outstanding work! You're mastering Sanskrit pronunciation."
-        elif accuracy >= 70:
-            feedback = f"Good job! You achieved {accuracy:.1f}% accuracy. Keep refining your pronunciation."
-            motivation = "You're making great progress!"
-        else:
-            feedback = f"Keep practicing! You achieved {accuracy:.1f}% accuracy. Focus on the highlighted words."
-            motivation = "Every practice session brings improvement!"
-        
+    def _parse_response(self, text: str, accuracy: float) -> Dict[str, str]:
+        """Parse Gemini response into structured feedback"""
+        sections = self._parse_sections(text)
         return {
-            'feedback': feedback,
-            'motivation': motivation,
-            'practice_tips': self._default_tips(accuracy)
+            'feedback': sections.get('feedback', "Great effort!"),
+            'motivation': sections.get('motivation', "Keep practicing!"),
+            'practice_tips': sections.get('practice_tips') or default_tips(accuracy)
         }
     
-    def _default_tips(self, accuracy: float) -> List[str]:
-        """Default practice tips based on accuracy"""
-        if accuracy >= 90:
-            return ["Try practicing at a faster pace", "Move on to more challenging shlokas"]
-        elif accuracy >= 70:
-            return ["Listen to the original audio again", "Focus on words you missed"]
-        else:
-            return ["Break the shloka into smaller parts", "Practice each word slowly", "Repeat multiple times"]
+    def _parse_sections(self, text: str) -> Dict[str, Any]:
+        """Extract whichever FEEDBACK/MOTIVATION/TIPS sections appear in the text"""
+        sections = {}
+        
+        # re.split yields [preamble, label, body, label, body, ...]
+        parts = _SECTION_RE.split(text)
+        for label, body in zip(parts[1::2], parts[2::2]):
+            lines = [line for line in map(str.strip, body.splitlines()) if line]
+            if label == 'FEEDBACK':
+                sections['feedback'] = ' '.join(lines)
+            elif label == 'MOTIVATION':
+                sections['motivation'] = ' '.join(lines)
+            else:
+                # Accept any line format: bullets, numbers, or plain text
+                sections.setdefault('practice_tips', []).extend(
+                    cleaned for cleaned in (_BULLET_RE.sub('', line) for line in lines) if cleaned
+                )
+        
+        return sections
+
+
+# Shared instance so every session reuses one client and cache
+_generator = None
+_generator_lock = threading.Lock()
+
+def get_feedback_generator() -> FeedbackGenerator:
+    """Get or create the feedback generator singleton"""
+    global _generator
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                _generator = FeedbackGenerator()
+    return _generator
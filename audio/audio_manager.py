@@ -4,12 +4,12 @@ Handles audio transcription via Groq Whisper API
 """
 import scipy.io.wavfile as wav
 import numpy as np
-import requests
 import tempfile
 from pathlib import Path
 from typing import Dict, Any
 
 from core.config import AudioConfig
+from utils.http_session import get_http_session, response_json
 
 
 class AudioManager:
@@ -55,7 +55,7 @@ class AudioManager:
                     'response_format': (None, 'json')
                 }
                 
-                response = requests.post(AudioConfig.GROQ_API_URL, headers=headers, files=files, timeout=30)
+                response = get_http_session().post(AudioConfig.GROQ_API_URL, headers=headers, files=files, timeout=30)
                 
                 # Clean up temp file
                 temp_file_path = Path(temp_file.name)
@@ -63,7 +63,7 @@ class AudioManager:
                     temp_file_path.unlink()
                 
                 if response.status_code == 200:
-                    result = response.json()
+                    result = response_json(response)
                     return {
                         'success': True,
                         'transcription': result.get('text', '').strip()
@@ -7,14 +7,16 @@ import numpy as np
 import scipy.io.wavfile as wav
 from typing import Dict, Tuple, Optional, List
 import base64
+import functools
+import importlib.util
 import io
+import logging
+from difflib import SequenceMatcher
 
-# Try to import additional audio libraries for MP3 support
-try:
-    import librosa
-    HAS_LIBROSA = True
-except ImportError:
-    HAS_LIBROSA = False
+# Try to import additional audio libraries for MP3 support.
+# librosa is slow to import and WAV audio never needs it, so it is only
+# imported the first time another format has to be decoded.
+HAS_LIBROSA = importlib.util.find_spec('librosa') is not None
 
 try:
     from pydub import AudioSegment
@@ -24,10 +26,20 @@ except ImportError:
 
 # Import timestamp extraction
 from audio.word_timestamp_extractor import (
+    _PUNCT_RE,
     get_word_timestamps_from_audio,
     find_word_in_timestamps
 )
 
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_librosa():
+    """Import librosa on first use"""
+    import librosa
+    return librosa
+
 
 def calculate_word_character_duration(word: str) -> float:
     """
@@ -102,7 +114,7 @@ def get_audio_duration(audio_bytes: bytes, audio_format: str = 'mp3') -> float:
         return 10.0
         
     except Exception as e:
-        print(f"Error getting audio duration: {e}")
+        logger.warning("Error getting audio duration: %s", e)
         return 10.0
 
 
@@ -129,16 +141,16 @@ def load_audio_data(audio_bytes: bytes, audio_format: str = 'mp3') -> Tuple[int,
             
             return sample_rate, audio_data
         except Exception as e:
-            print(f"Scipy WAV loading failed: {e}")
+            logger.debug("Scipy WAV loading failed: %s", e)
     
     # Try librosa (works for many formats)
     if HAS_LIBROSA:
         try:
             audio_io = io.BytesIO(audio_bytes)
-            audio_data, sample_rate = librosa.load(audio_io, sr=None, mono=True)
+            audio_data, sample_rate = _load_librosa().load(audio_io, sr=None, mono=True)
             return sample_rate, audio_data
         except Exception as e:
-            print(f"Librosa loading failed: {e}")
+            logger.debug("Librosa loading failed: %s", e)
     
     # Try pydub (requires ffmpeg but supports many formats)
     if HAS_PYDUB:
@@ -163,19 +175,16 @@ def load_audio_data(audio_bytes: bytes, audio_format: str = 'mp3') -> Tuple[int,
             
             return sample_rate, audio_data
         except Exception as e:
-            print(f"Pydub loading failed: {e}")
+            logger.debug("Pydub loading failed: %s", e)
     
     raise Exception(f"Could not load {audio_format} audio - no suitable library available or working")
 
 
 def calculate_word_similarity(word1: str, word2: str) -> float:
     """Calculate similarity between two words using character-level matching"""
-    from difflib import SequenceMatcher
-    
     # Remove common punctuation
-    import re
-    word1_clean = re.sub(r'[।॥\s]+', '', word1.strip())
-    word2_clean = re.sub(r'[।॥\s]+', '', word2.strip())
+    word1_clean = _PUNCT_RE.sub('', word1.strip())
+    word2_clean = _PUNCT_RE.sub('', word2.strip())
     
     # Calculate similarity ratio
     similarity = SequenceMatcher(None, word1_clean, word2_clean).ratio()
@@ -203,41 +212,39 @@ def extract_word_audio(
     Returns:
         WAV audio bytes for the word, or None if extraction fails
     """
-    print(f"\n=== Word Audio Extraction ===")
-    print(f"Target word: {word_text}")
-    print(f"Format: {shloka_audio_format}")
+    logger.debug("Extracting word audio for '%s' (%s)", word_text, shloka_audio_format)
     
     try:
         # Decode base64 audio
         audio_bytes = base64.b64decode(shloka_audio_base64)
-        print(f"Audio size: {len(audio_bytes)} bytes")
+        logger.debug("Audio size: %d bytes", len(audio_bytes))
         
         word_timing = None
         
         # Method 1: Use pre-computed timestamps if available
         if word_timestamps:
-            print(f"Using pre-computed timestamps ({len(word_timestamps)} words)")
+            logger.debug("Using pre-computed timestamps (%d words)", len(word_timestamps))
             word_timing = find_word_in_timestamps(word_text, word_timestamps)
         
         # Method 2: Get timestamps from Whisper API (more accurate)
         if not word_timing:
-            print("Getting word timestamps from Whisper API...")
+            logger.debug("Getting word timestamps from Whisper API")
             timestamp_result = get_word_timestamps_from_audio(audio_bytes, shloka_audio_format)
             
             if timestamp_result.get('success') and timestamp_result.get('words'):
                 words_data = timestamp_result['words']
-                print(f"Got {len(words_data)} words from API")
+                logger.debug("Got %d words from API", len(words_data))
                 word_timing = find_word_in_timestamps(word_text, words_data)
         
         if not word_timing:
-            print(f"✗ Could not find timestamps for '{word_text}'")
+            logger.info("Could not find timestamps for '%s'", word_text)
             return None
         
-        print(f"✓ Word timing: {word_timing['start_time']:.2f}s - {word_timing['end_time']:.2f}s")
+        logger.debug("Word timing: %.2fs - %.2fs", word_timing['start_time'], word_timing['end_time'])
         
         # Load audio data
         sample_rate, audio_data = load_audio_data(audio_bytes, shloka_audio_format)
-        print(f"Loaded audio: {sample_rate}Hz, {len(audio_data)} samples")
+        logger.debug("Loaded audio: %dHz, %d samples", sample_rate, len(audio_data))
         
         # Convert timing to sample indices
         start_sample = int(word_timing['start_time'] * sample_rate)
@@ -248,17 +255,17 @@ def extract_word_audio(
         start_padded = max(0, start_sample - padding_samples)
         end_padded = min(len(audio_data), end_sample + padding_samples)
         
-        print(f"Extracting samples {start_padded} to {end_padded}")
+        logger.debug("Extracting samples %d to %d", start_padded, end_padded)
         
         # Extract word segment
         word_audio_segment = audio_data[start_padded:end_padded]
         
         # Ensure we have data
         if len(word_audio_segment) == 0:
-            print("ERROR: Extracted segment is empty")
+            logger.warning("Extracted segment for '%s' is empty", word_text)
             return None
         
-        print(f"Extracted {len(word_audio_segment)} samples")
+        logger.debug("Extracted %d samples", len(word_audio_segment))
         
         # Convert to 16-bit integer with proper clipping
         word_audio_int16 = np.clip(word_audio_segment * 32767, -32768, 32767).astype(np.int16)
@@ -273,16 +280,13 @@ def extract_word_audio(
             audio_buffer.seek(0)
             
             result = audio_buffer.read()
-            print(f"Generated word audio: {len(result)} bytes")
-            print("=== Extraction Successful ===\n")
+            logger.debug("Generated word audio: %d bytes", len(result))
             
             return result
         except Exception as write_error:
-            print(f"ERROR writing WAV: {write_error}")
+            logger.warning("Error writing word WAV: %s", write_error)
             return None
         
     except Exception as e:
-        print(f"ERROR in extract_word_audio: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Word audio extraction failed for '%s'", word_text)
         return None
@@ -2,9 +2,17 @@
 Word Timestamp Extraction using Whisper API
 Gets actual word-level timestamps from audio using verbose_json response
 """
-import requests
+import logging
+import re
+from difflib import SequenceMatcher
 from typing import Dict, List, Optional, Any
 from core.config import AudioConfig
+from utils.http_session import get_http_session, response_json
+
+logger = logging.getLogger(__name__)
+
+# Danda marks and whitespace ignored when comparing words
+_PUNCT_RE = re.compile(r'[।॥\s]+')
 
 
 def get_word_timestamps_from_audio(
@@ -40,9 +48,9 @@ def get_word_timestamps_from_audio(
             'timestamp_granularities[]': (None, 'word'),
         }
         
-        print(f"Requesting word timestamps from Groq API...")
+        logger.debug("Requesting word timestamps from Groq API")
         
-        response = requests.post(
+        response = get_http_session().post(
             AudioConfig.GROQ_API_URL,
             headers=headers,
             files=files,
@@ -50,19 +58,19 @@ def get_word_timestamps_from_audio(
         )
         
         if response.status_code == 200:
-            result = response.json()
+            result = response_json(response)
             
             # Extract word timestamps
             words = result.get('words', [])
             segments = result.get('segments', [])
             text = result.get('text', '').strip()
             
-            print(f"✓ Got {len(words)} words with timestamps")
-            print(f"✓ Text: {text[:100]}...")
-            
-            # Debug: Print first few word timestamps
-            for i, word in enumerate(words[:5]):
-                print(f"  Word {i+1}: '{word.get('word', '')}' ({word.get('start', 0):.2f}s - {word.get('end', 0):.2f}s)")
+            logger.info("Got %d words with timestamps", len(words))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Text: %s...", text[:100])
+                for i, word in enumerate(words[:5]):
+                    logger.debug("  Word %d: '%s' (%.2fs - %.2fs)",
+                                 i + 1, word.get('word', ''), word.get('start', 0), word.get('end', 0))
             
             return {
                 'success': True,
@@ -74,20 +82,19 @@ def get_word_timestamps_from_audio(
         else:
             error_msg = f"API request failed: {response.status_code}"
             try:
-                error_detail = response.json()
+                error_detail = response_json(response)
                 error_msg += f" - {error_detail}"
-            except:
+            except ValueError:
+                # Error bodies are not always JSON
                 pass
-            print(f"✗ {error_msg}")
+            logger.warning("%s", error_msg)
             return {
                 'success': False,
                 'error': error_msg
             }
             
     except Exception as e:
-        print(f"✗ Error getting word timestamps: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error getting word timestamps: %s", e)
         return {
             'success': False,
             'error': str(e)
@@ -138,39 +145,37 @@ def find_word_in_timestamps(
     Returns:
         Timing dict or None
     """
-    import re
-    from difflib import SequenceMatcher
-    
     target_clean = target_word.strip()
-    target_no_punct = re.sub(r'[।॥\s]+', '', target_clean)
+    target_no_punct = _PUNCT_RE.sub('', target_clean)
     
-    # First pass: exact match
+    # Normalize every API word once; all four passes reuse these forms
+    candidates = []
     for word_info in words_data:
         word = word_info.get('word', '').strip()
+        candidates.append((word_info, word, _PUNCT_RE.sub('', word)))
+    
+    # First pass: exact match
+    for word_info, word, _ in candidates:
         if word == target_clean:
-            print(f"✓ Exact match: '{word}'")
+            logger.debug("Exact match: '%s'", word)
             return {
                 'start_time': word_info.get('start', 0),
                 'end_time': word_info.get('end', 0)
             }
     
     # Second pass: match without punctuation
-    for word_info in words_data:
-        word = word_info.get('word', '').strip()
-        word_no_punct = re.sub(r'[।॥\s]+', '', word)
+    for word_info, word, word_no_punct in candidates:
         if word_no_punct == target_no_punct:
-            print(f"✓ Match (no punct): '{word}'")
+            logger.debug("Match (no punct): '%s'", word)
             return {
                 'start_time': word_info.get('start', 0),
                 'end_time': word_info.get('end', 0)
             }
     
     # Third pass: substring match
-    for word_info in words_data:
-        word = word_info.get('word', '').strip()
-        word_no_punct = re.sub(r'[।॥\s]+', '', word)
+    for word_info, word, word_no_punct in candidates:
         if target_no_punct in word_no_punct or word_no_punct in target_no_punct:
-            print(f"✓ Substring match: '{word}'")
+            logger.debug("Substring match: '%s'", word)
             return {
                 'start_time': word_info.get('start', 0),
                 'end_time': word_info.get('end', 0)
@@ -180,21 +185,25 @@ def find_word_in_timestamps(
     best_match = None
     best_similarity = 0.0
     
-    for word_info in words_data:
-        word = word_info.get('word', '').strip()
-        word_no_punct = re.sub(r'[।॥\s]+', '', word)
-        
-        similarity = SequenceMatcher(None, target_no_punct, word_no_punct).ratio()
+    # The target stays first: ratio() is not symmetric, and SequenceMatcher only
+    # caches the second sequence, so reusing a matcher across candidates saves
+    # nothing. The cheap upper bounds skip the full ratio() for words that
+    # cannot beat the current best
+    for word_info, _, word_no_punct in candidates:
+        matcher = SequenceMatcher(None, target_no_punct, word_no_punct)
+        if matcher.real_quick_ratio() <= best_similarity or matcher.quick_ratio() <= best_similarity:
+            continue
+        similarity = matcher.ratio()
         if similarity > best_similarity:
             best_similarity = similarity
             best_match = word_info
     
     if best_match and best_similarity >= 0.5:
-        print(f"✓ Fuzzy match: '{best_match.get('word', '')}' ({best_similarity:.1%})")
+        logger.debug("Fuzzy match: '%s' (%.1f%%)", best_match.get('word', ''), best_similarity * 100)
         return {
             'start_time': best_match.get('start', 0),
             'end_time': best_match.get('end', 0)
         }
     
-    print(f"✗ No match found for '{target_word}'")
+    logger.info("No match found for '%s'", target_word)
     return None
@@ -37,6 +37,9 @@ class AppConfig:
     MAX_SPEAKER = 27
     MAX_SHLOKAS_DISPLAY = 20  # Limit for demo purposes
     
+    # Logging level for the app's module loggers (DEBUG, INFO, WARNING, ...)
+    LOG_LEVEL = os.environ.get("LOG_LEVEL", "WARNING").upper()
+    
     @staticmethod
     def get_speaker_id(speaker_num):
         """Generate speaker ID from number"""
@@ -70,6 +73,12 @@ class AudioConfig:
     
     GROQ_API_URL = "https://api.groq.com/openai/v1/audio/transcriptions"
     WHISPER_MODEL = "whisper-large-v3-turbo"
+    
+    # Shared HTTP connection pool for API requests
+    HTTP_POOL_CONNECTIONS = 4
+    HTTP_POOL_MAXSIZE = 16
+    HTTP_MAX_RETRIES = 2  # Retries for dropped connections and 429/5xx replies
+    HTTP_RETRY_BACKOFF = 0.5  # Seconds; doubled on each retry
 
 
 class AnalysisConfig:
@@ -78,6 +87,7 @@ class AnalysisConfig:
     # Analysis thresholds
     WORD_SIMILARITY_THRESHOLD = 0.7
     PASSING_ACCURACY = 70.0
+    FOLD_CONFUSABLE_SOUNDS = False  # Treat sounds the transcriber mixes up (b/v, i/ī, u/ū, o/au) as equal; off since vowel length is graded
     
     # LLM Feedback settings - Read from Streamlit secrets or environment variables
     GEMINI_API_KEY = None
@@ -94,6 +104,24 @@ class AnalysisConfig:
     GEMINI_MODEL = "gemini-2.5-flash"  # Use the newer model with better quotas
     USE_LLM_FEEDBACK = True
     LLM_FEEDBACK_RETRY_LIMIT = 2
+    LLM_INIT_RETRY_SECONDS = 60  # Minimum wait before retrying a failed Gemini setup
+    SKIP_LLM_FEEDBACK_ACCURACY = 100.0  # At or above this (with no missed words) use rule-based feedback
+    
+    # Feedback response cache (bounded LRU with TTL, backed by an on-disk store)
+    FEEDBACK_CACHE_ENABLED = True
+    FEEDBACK_CACHE_MAX_ENTRIES = 512
+    FEEDBACK_CACHE_TTL_SECONDS = 24 * 3600
+    FEEDBACK_DISK_CACHE_PATH = Path(__file__).parent.parent / "data" / "feedback_cache.db"
+    FEEDBACK_DISK_CACHE_TTL_SECONDS = 7 * 24 * 3600
+    FEEDBACK_DISK_CACHE_FLUSH_SECONDS = 5  # Longest wait for queued writes at shutdown
+    
+    # Near-duplicate analyses (Jaccard similarity of mispronounced words) reuse
+    # the Gemini feedback of a similar attempt instead of another call. Off by
+    # default: that text may quote the other attempt's accuracy or words
+    SIMILAR_FEEDBACK_ENABLED = False
+    SIMILAR_FEEDBACK_MAX_ENTRIES = 1024
+    SIMILAR_FEEDBACK_THRESHOLD = 0.8
+    SIMILAR_FEEDBACK_ACCURACY_BUCKET = 5.0  # Accuracy percentage points per bucket
     
     # Ollama settings for local LLM
     OLLAMA_BASE_URL = "http://localhost:11434"
@@ -117,6 +145,7 @@ class PracticeConfig:
     # Word-level practice thresholds
     WORD_ACCURACY_THRESHOLD = 60.0  # Minimum accuracy for individual word to be considered "correct"
     MINIMUM_ATTEMPTS_FOR_SUGGESTION = 3  # Minimum attempts before suggesting alphabet practice
+    WORD_HISTORY_WINDOW = 50  # Recent attempts kept per word; totals are tracked separately
 
 
 # Sanskrit language constants
@@ -6,10 +6,31 @@ from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import json
+import threading
+from dataclasses import asdict
+
+from sqlalchemy import func, select
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 from database.models import Speaker, Shloka, PracticeSession, WordPractice, get_session
 
 
+def _dumps(value) -> str:
+    """Serialize to a JSON string, using orjson when it is installed"""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+        except TypeError:
+            pass
+    # Word alignment results are slotted dataclasses; orjson handles them natively
+    return json.dumps(value, default=asdict)
+
+
 class DatabaseManager:
     """Manager class for database operations"""
     
@@ -118,7 +139,7 @@ class DatabaseManager:
             accuracy_score=accuracy_score,
             pronunciation_score=pronunciation_score,
             llm_feedback=llm_feedback,
-            word_comparison=json.dumps(word_comparison) if word_comparison else None,
+            word_comparison=_dumps(word_comparison) if word_comparison else None,
             practice_mode=practice_mode
         )
         
@@ -152,33 +173,26 @@ class DatabaseManager:
     
     def get_practice_stats(self, speaker_id: str = None) -> Dict:
         """Get practice statistics"""
-        query = self.session.query(PracticeSession).join(Shloka).join(Speaker)
+        # Aggregate in SQL so no session rows (and their audio blobs) are loaded
+        query = self.session.query(
+            func.count(PracticeSession.id),
+            func.avg(PracticeSession.accuracy_score),
+            func.avg(PracticeSession.pronunciation_score),
+            func.max(PracticeSession.accuracy_score),
+            func.max(PracticeSession.pronunciation_score)
+        ).select_from(PracticeSession).join(Shloka).join(Speaker)
         
         if speaker_id:
             query = query.filter(Speaker.speaker_id == speaker_id)
         
-        total_sessions = query.count()
-        
-        if total_sessions == 0:
-            return {
-                'total_sessions': 0,
-                'average_accuracy': 0,
-                'average_pronunciation': 0,
-                'best_accuracy': 0,
-                'best_pronunciation': 0
-            }
-        
-        sessions = query.all()
-        
-        accuracies = [s.accuracy_score for s in sessions if s.accuracy_score is not None]
-        pronunciations = [s.pronunciation_score for s in sessions if s.pronunciation_score is not None]
+        total_sessions, avg_accuracy, avg_pronunciation, best_accuracy, best_pronunciation = query.one()
         
         return {
             'total_sessions': total_sessions,
-            'average_accuracy': sum(accuracies) / len(accuracies) if accuracies else 0,
-            'average_pronunciation': sum(pronunciations) / len(pronunciations) if pronunciations else 0,
-            'best_accuracy': max(accuracies) if accuracies else 0,
-            'best_pronunciation': max(pronunciations) if pronunciations else 0
+            'average_accuracy': avg_accuracy or 0,
+            'average_pronunciation': avg_pronunciation or 0,
+            'best_accuracy': best_accuracy or 0,
+            'best_pronunciation': best_pronunciation or 0
         }
     
     # ==================== WORD PRACTICE OPERATIONS ====================
@@ -269,21 +283,36 @@ class DatabaseManager:
     
     def get_database_stats(self) -> Dict:
         """Get overall database statistics"""
+        # Count every category in a single round trip instead of one query each
+        def _count(model, *criteria):
+            return select(func.count(model.id)).where(*criteria).scalar_subquery()
+        
+        speakers, shlokas, sessions, word_practices, mastered = self.session.query(
+            _count(Speaker),
+            _count(Shloka),
+            _count(PracticeSession),
+            _count(WordPractice),
+            _count(WordPractice, WordPractice.mastered == True)
+        ).one()
+        
         return {
-            'total_speakers': self.session.query(Speaker).count(),
-            'total_shlokas': self.session.query(Shloka).count(),
-            'total_practice_sessions': self.session.query(PracticeSession).count(),
-            'total_word_practices': self.session.query(WordPractice).count(),
-            'mastered_words': self.session.query(WordPractice).filter_by(mastered=True).count()
+            'total_speakers': speakers,
+            'total_shlokas': shlokas,
+            'total_practice_sessions': sessions,
+            'total_word_practices': word_practices,
+            'mastered_words': mastered
         }
 
 
-# Singleton instance for easy access
+# Singleton instance for easy access (guarded for concurrent Streamlit sessions)
 _db_manager = None
+_db_manager_lock = threading.Lock()
 
 def get_db_manager(db_path=None) -> DatabaseManager:
     """Get or create database manager singleton"""
     global _db_manager
     if _db_manager is None:
-        _db_manager = DatabaseManager(db_path)
+        with _db_manager_lock:
+            if _db_manager is None:
+                _db_manager = DatabaseManager(db_path)
     return _db_manager
@@ -7,10 +7,16 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from datetime import datetime
 import os
+import threading
 from pathlib import Path
 
 Base = declarative_base()
 
+# Engines and session factories are thread-safe and expensive to build, so
+# keep one per database path instead of creating them on every call.
+_session_factories = {}
+_session_factories_lock = threading.Lock()
+
 
 class Speaker(Base):
     """Model for speakers in the dataset"""
@@ -145,8 +151,14 @@ def get_session(db_path=None):
     if db_path is None:
         db_path = get_database_path()
     
-    engine = create_engine(f'sqlite:///{db_path}', echo=False)
-    Session = sessionmaker(bind=engine)
+    Session = _session_factories.get(db_path)
+    if Session is None:
+        with _session_factories_lock:
+            Session = _session_factories.get(db_path)
+            if Session is None:
+                engine = create_engine(f'sqlite:///{db_path}', echo=False)
+                Session = sessionmaker(bind=engine)
+                _session_factories[db_path] = Session
     return Session()
 
 
@@ -4,6 +4,7 @@ Main entry point for the web application
 """
 import streamlit as st
 from pathlib import Path
+import logging
 import sys
 
 # Add the project root to the Python path for proper imports
@@ -19,6 +20,8 @@ from streamlit_ui.components.right_panel import render_right_panel
 from streamlit_ui.components.advanced_chanting import render_advanced_chanting
 from core.config import AppConfig
 
+logging.basicConfig(level=AppConfig.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
 
 def initialize_session_state():
     """Initialize Streamlit session state variables"""
@@ -2,11 +2,14 @@
 Backend Integration for Streamlit App
 Uses the SAME analysis logic as the tkinter application
 """
+import logging
 import tempfile
-import requests
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, Any
 import sys
+import threading
 import numpy as np
 
 # Add v2 to path for imports
@@ -15,7 +18,11 @@ sys.path.insert(0, str(v2_path))
 
 from core.config import AudioConfig, AnalysisConfig
 from audio.audio_manager import AudioManager
-from analysis.feedback_generator import FeedbackGenerator
+from analysis.feedback_generator import FeedbackGenerator, get_feedback_generator, simple_feedback
+from utils.http_session import get_http_session, response_json
+from utils.text_processor import TextProcessor
+
+logger = logging.getLogger(__name__)
 
 
 class StreamlitBackend:
@@ -24,17 +31,28 @@ class StreamlitBackend:
     def __init__(self):
         """Initialize backend components"""
         self.audio_manager = AudioManager()
-        self.feedback_generator = FeedbackGenerator()
         self.audio_manager.initialize()
+        # In-flight or finished original-shloka transcriptions, keyed by shloka id
+        self._original_futures: Dict[str, Future] = {}
+        self._original_lock = threading.Lock()
+    
+    @cached_property
+    def feedback_generator(self) -> FeedbackGenerator:
+        """Shared Gemini feedback generator, created on first full-shloka analysis"""
+        return get_feedback_generator()
     
-    def _generate_simple_feedback(self, accuracy: float) -> str:
-        """Generate simple feedback based on accuracy"""
-        if accuracy >= 90:
-            return "Excellent pronunciation! Your chanting is very accurate."
-        elif accuracy >= 70:
-            return f"Good job! You achieved {accuracy:.1f}% accuracy."
-        else:
-            return f"Keep practicing! You achieved {accuracy:.1f}% accuracy."
+    @cached_property
+    def _transcription_executor(self) -> ThreadPoolExecutor:
+        """Worker pool for transcribing the original shloka alongside the user's audio"""
+        return ThreadPoolExecutor(max_workers=4, thread_name_prefix='transcribe')
+    
+    def _to_llm_feedback(self, feedback: Dict[str, Any]) -> Dict[str, Any]:
+        """Map FeedbackGenerator output onto the llm_feedback shape used by the UI"""
+        return {
+            'analysis': feedback.get('feedback', 'Good effort!'),
+            'motivation': feedback.get('motivation', 'Keep practicing!'),
+            'practice_tips': feedback.get('practice_tips', [])
+        }
     
     def transcribe_audio(self, audio_bytes: bytes) -> Dict[str, Any]:
         """
@@ -76,6 +94,120 @@ class StreamlitBackend:
                 'error': f'Transcription error: {str(e)}'
             }
     
+    def prefetch_original(self, original_shloka: Dict[str, Any]) -> Future:
+        """
+        Start transcribing the original shloka in the background.
+        Called once the user has recorded or uploaded audio, so the Groq round
+        trip overlaps with them pressing Analyze; concurrent callers for the
+        same shloka share one request, and failed attempts are retried.
+        """
+        key = original_shloka.get('id')
+        with self._original_lock:
+            # Only the shloka being practised keeps a finished prefetch; the
+            # transcription itself is already stored on the shloka dict
+            for other in [k for k, f in self._original_futures.items() if k != key and f.done()]:
+                del self._original_futures[other]
+            future = self._original_futures.get(key)
+            failed = future is not None and future.done() and (
+                future.exception() is not None or not future.result().get('success'))
+            if future is None or failed:
+                future = self._transcription_executor.submit(self._transcribe_original, original_shloka)
+                self._original_futures[key] = future
+        return future
+    
+    def _transcribe_original(self, original_shloka: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Transcribe the original shloka audio from the database (base64 encoded).
+        The transcription and word timestamps are stored on the shloka dict so
+        repeated attempts at the same shloka skip the Groq round trip.
+        """
+        cached_transcription = original_shloka.get('original_transcription')
+        if cached_transcription is not None:
+            return self._original_result(original_shloka, cached_transcription)
+        
+        original_audio_data = original_shloka.get('audio_data')
+        original_audio_format = original_shloka.get('audio_format', 'mp3')
+        
+        if not original_audio_data:
+            return {
+                'success': False,
+                'error': 'Original audio data not found in database'
+            }
+        
+        # Decode base64 audio data
+        import base64
+        try:
+            audio_bytes = base64.b64decode(original_audio_data)
+        except Exception as decode_error:
+            return {
+                'success': False,
+                'error': f"Failed to decode audio data: {str(decode_error)}"
+            }
+        
+        # Transcribe original audio with WORD-LEVEL TIMESTAMPS using Groq API
+        try:
+            from audio.word_timestamp_extractor import get_word_timestamps_from_audio
+            
+            # Get word timestamps from the original shloka audio
+            timestamp_result = get_word_timestamps_from_audio(audio_bytes, original_audio_format)
+            
+            if timestamp_result.get('success'):
+                original_transcription = timestamp_result.get('text', '').strip()
+                # Store word timestamps on the shloka for later use
+                word_timestamps = timestamp_result.get('words', [])
+                original_shloka['word_timestamps'] = word_timestamps
+                logger.debug("Stored %d word timestamps", len(word_timestamps))
+            else:
+                # Fallback to simple transcription
+                headers = {
+                    'Authorization': f'Bearer {AudioConfig.GROQ_API_KEY}'
+                }
+                
+                files = {
+                    'file': (f'original.{original_audio_format}', audio_bytes, f'audio/{original_audio_format}'),
+                    'model': (None, AudioConfig.WHISPER_MODEL),
+                    'language': (None, 'hi'),
+                    'response_format': (None, 'json')
+                }
+                
+                response = get_http_session().post(
+                    AudioConfig.GROQ_API_URL,
+                    headers=headers,
+                    files=files,
+                    timeout=30
+                )
+                
+                if response.status_code == 200:
+                    result = response_json(response)
+                    original_transcription = result.get('text', '').strip()
+                else:
+                    return {
+                        'success': False,
+                        'error': f"Failed to transcribe original audio: HTTP {response.status_code}"
+                    }
+                
+        except Exception as transcribe_error:
+            return {
+                'success': False,
+                'error': f"Error transcribing original audio: {str(transcribe_error)}"
+            }
+        
+        original_shloka['original_transcription'] = original_transcription
+        return self._original_result(original_shloka, original_transcription)
+    
+    def _original_result(self, original_shloka: Dict[str, Any], transcription: str) -> Dict[str, Any]:
+        """
+        Build the shared result for an original shloka transcription.
+        The words are split here, on the prefetch worker, and the result is
+        reused by every attempt at the shloka, so the split runs once.
+        """
+        return {
+            'success': True,
+            'transcription': transcription,
+            'words': tuple(TextProcessor.smart_word_split(transcription)),
+            'word_timestamps': original_shloka.get('word_timestamps')
+        }
+    
     def analyze_pronunciation(
         self, 
         user_audio_bytes: bytes,
@@ -87,6 +219,11 @@ class StreamlitBackend:
         Then comparing the two transcriptions - this ensures proper word splitting
         """
         try:
+            # Both transcriptions are independent network calls, so the original
+            # shloka's runs in the background (usually already started when the
+            # shloka was selected) while the user's audio is transcribed
+            original_future = self.prefetch_original(original_shloka)
+            
             # Step 1: Transcribe user's audio
             user_transcription_result = self.transcribe_audio(user_audio_bytes)
             if not user_transcription_result.get('success'):
@@ -96,97 +233,34 @@ class StreamlitBackend:
                 }
             user_transcription = user_transcription_result.get('transcription', '').strip()
             
-            # Step 2: Transcribe original audio from database (base64 encoded)
-            original_audio_data = original_shloka.get('audio_data')
-            original_audio_format = original_shloka.get('audio_format', 'mp3')
-            
-            if not original_audio_data:
-                return {
-                    'success': False,
-                    'error': 'Original audio data not found in database'
-                }
-            
-            # Decode base64 audio data
-            import base64
-            try:
-                audio_bytes = base64.b64decode(original_audio_data)
-            except Exception as decode_error:
-                return {
-                    'success': False,
-                    'error': f"Failed to decode audio data: {str(decode_error)}"
-                }
-            
-            # Transcribe original audio with WORD-LEVEL TIMESTAMPS using Groq API
-            try:
-                from audio.word_timestamp_extractor import get_word_timestamps_from_audio
-                
-                # Get word timestamps from the original shloka audio
-                timestamp_result = get_word_timestamps_from_audio(audio_bytes, original_audio_format)
-                
-                if timestamp_result.get('success'):
-                    original_transcription = timestamp_result.get('text', '').strip()
-                    # Store word timestamps in session state for later use
-                    import streamlit as st
-                    if 'current_shloka' in st.session_state and st.session_state.current_shloka:
-                        st.session_state.current_shloka['word_timestamps'] = timestamp_result.get('words', [])
-                        print(f"✓ Stored {len(timestamp_result.get('words', []))} word timestamps")
-                else:
-                    # Fallback to simple transcription
-                    headers = {
-                        'Authorization': f'Bearer {AudioConfig.GROQ_API_KEY}'
-                    }
-                    
-                    files = {
-                        'file': (f'original.{original_audio_format}', audio_bytes, f'audio/{original_audio_format}'),
-                        'model': (None, AudioConfig.WHISPER_MODEL),
-                        'language': (None, 'hi'),
-                        'response_format': (None, 'json')
-                    }
-                    
-                    response = requests.post(
-                        AudioConfig.GROQ_API_URL,
-                        headers=headers,
-                        files=files,
-                        timeout=30
-                    )
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        original_transcription = result.get('text', '').strip()
-                    else:
-                        return {
-                            'success': False,
-                            'error': f"Failed to transcribe original audio: HTTP {response.status_code}"
-                        }
-                    
-            except Exception as transcribe_error:
-                return {
-                    'success': False,
-                    'error': f"Error transcribing original audio: {str(transcribe_error)}"
-                }
+            # Step 2: Transcribe original audio (reused across attempts at the same shloka)
+            original_result = original_future.result()
+            if not original_result.get('success'):
+                return original_result
+            original_transcription = original_result['transcription']
+            # The prefetch may have run on another session's copy of this shloka
+            original_shloka.setdefault('original_transcription', original_transcription)
+            if original_result.get('word_timestamps') is not None:
+                original_shloka.setdefault('word_timestamps', original_result['word_timestamps'])
             
             # Step 3: Now compare the two transcriptions
-            # Split both transcriptions into words
-            from utils.text_processor import TextProcessor
-            text_processor = TextProcessor()
-            
-            original_words = text_processor.smart_word_split(original_transcription)
-            user_words = text_processor.smart_word_split(user_transcription)
+            # The original was split once when it was transcribed
+            original_words = list(original_result['words'])
+            user_words = TextProcessor.smart_word_split(user_transcription)
             
             # Align words for comparison
-            word_results = text_processor.align_words(original_words, user_words, [])
+            word_results = TextProcessor.align_words(original_words, user_words)
             
-            # Calculate metrics
-            accuracy = text_processor.calculate_accuracy(word_results)
-            correct_count = sum(1 for r in word_results if r['correct'] and r['original'])
-            total_count = len([r for r in word_results if r['original']])
-            incorrect_words = text_processor.extract_incorrect_words(word_results)
+            # Calculate metrics (accuracy, counts and incorrect words in one pass)
+            summary = TextProcessor.summarize_results(word_results)
+            accuracy = summary['accuracy']
+            incorrect_words = summary['incorrect_words']
             
             # Create analysis result
             analysis_result = {
                 'accuracy': accuracy,
-                'correct_count': correct_count,
-                'total_count': total_count,
+                'correct_count': summary['correct_count'],
+                'total_count': summary['total_count'],
                 'word_results': word_results,
                 'incorrect_words': incorrect_words,
                 'passed': accuracy >= AnalysisConfig.PASSING_ACCURACY,
@@ -198,35 +272,20 @@ class StreamlitBackend:
             }
             
             # Generate feedback using the SAME method as tkinter app
-            if analysis_result and analysis_result.get('accuracy') is not None:
+            if accuracy is not None:
                 try:
                     # Call generate_feedback with analysis_result dict - SAME as tkinter (app.py line 351)
                     feedback = self.feedback_generator.generate_feedback(
                         analysis_result=analysis_result,
                         user_level='beginner'
                     )
-                    
-                    # Add feedback to analysis result
-                    if feedback:
-                        analysis_result['llm_feedback'] = {
-                            'analysis': feedback.get('feedback', 'Good effort!'),
-                            'motivation': feedback.get('motivation', 'Keep practicing!'),
-                            'practice_tips': feedback.get('practice_tips', [])
-                        }
-                    else:
-                        # Fallback if feedback is None
-                        analysis_result['llm_feedback'] = {
-                            'analysis': self._generate_simple_feedback(analysis_result.get('accuracy', 0)),
-                            'motivation': 'Keep practicing!',
-                            'practice_tips': []
-                        }
-                except Exception as feedback_error:
-                    # If feedback generation fails, provide basic feedback
-                    analysis_result['llm_feedback'] = {
-                        'analysis': self._generate_simple_feedback(analysis_result.get('accuracy', 0)),
-                        'motivation': 'Keep practicing!',
-                        'practice_tips': []
-                    }
+                except Exception:
+                    feedback = None
+                
+                # Fall back to the generator's rule-based feedback if nothing came back
+                if not feedback:
+                    feedback = simple_feedback(analysis_result)
+                analysis_result['llm_feedback'] = self._to_llm_feedback(feedback)
                 
                 # Ensure success flag
                 analysis_result['success'] = True
@@ -236,18 +295,10 @@ class StreamlitBackend:
             if hasattr(st, 'session_state') and 'word_tracker' in st.session_state:
                 word_tracker = st.session_state.word_tracker
                 
-                # Record each incorrect word attempt
-                for word_result in word_results:
-                    if word_result.get('original') and not word_result.get('correct'):
-                        word_key = word_result.get('original', '')
-                        user_word = word_result.get('user', '')
-                        
-                        # Calculate individual word accuracy
-                        word_similarity = text_processor.calculate_similarity(word_key, user_word)
-                        word_accuracy = word_similarity * 100
-                        
-                        # Record the attempt
-                        word_tracker.record_word_attempt(word_key, word_accuracy, user_word)
+                # Record each incorrect word attempt, reusing the similarity from alignment
+                for word_result in incorrect_words:
+                    word_accuracy = word_result.similarity * 100
+                    word_tracker.record_word_attempt(word_result.original, word_accuracy, word_result.user)
             
             return analysis_result
         
@@ -258,12 +309,15 @@ class StreamlitBackend:
             }
 
 
-# Singleton instance
+# Singleton instance (Streamlit runs each user session on its own thread)
 _backend = None
+_backend_lock = threading.Lock()
 
 def get_backend() -> StreamlitBackend:
     """Get or create backend singleton"""
     global _backend
     if _backend is None:
-        _backend = StreamlitBackend()
+        with _backend_lock:
+            if _backend is None:
+                _backend = StreamlitBackend()
     return _backend
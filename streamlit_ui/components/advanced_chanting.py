@@ -5,28 +5,46 @@ Ported from chanting_app.py (Gradio) to Streamlit
 """
 import streamlit as st
 import numpy as np
+import bisect
+import functools
+import importlib.util
+import logging
+import operator
 import os
+import re
 import tempfile
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, List, Dict, Optional
 import io
 
-# Import audio libraries
-try:
+# Audio/plotting libraries are slow to import and this module loads with the
+# app, so only check they are installed here and import them on first use
+HAS_LIBROSA = importlib.util.find_spec('librosa') is not None
+HAS_MATPLOTLIB = importlib.util.find_spec('matplotlib') is not None
+
+
+@functools.lru_cache(maxsize=1)
+def _load_librosa():
+    """Import librosa the first time pitch extraction runs"""
     import librosa
-    HAS_LIBROSA = True
-except ImportError:
-    HAS_LIBROSA = False
-
-try:
-    import matplotlib
-    matplotlib.use('Agg')
-    import matplotlib.pyplot as plt
-    HAS_MATPLOTLIB = True
-except ImportError:
-    HAS_MATPLOTLIB = False
+    return librosa
+
+
+@functools.lru_cache(maxsize=1)
+def _load_pyplot():
+    """Import pyplot (headless backend) the first time a chart is drawn; None if unusable"""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return None
+    return plt
 
 from core.config import AudioConfig
+from utils.http_session import get_http_session, response_json
+
+logger = logging.getLogger(__name__)
 
 # Sanskrit character mappings
 DEVANAGARI_TO_IAST = {
@@ -47,99 +65,93 @@ DEVANAGARI_TO_IAST = {
     'ळ': 'La', '।': '|', '॥': '||', ' ': ' ',
 }
 
+# Transliterated vowel signs that replace a consonant's inherent 'a'
+_VOWEL_SIGN_VALUES = frozenset({'A', 'i', 'I', 'u', 'U', '_r', '_R', '_l', '_L', 'e', 'E', 'o', 'O'})
+
+
+def _build_transliteration_table() -> Tuple[Dict[str, str], re.Pattern]:
+    """
+    Precompute every consonant + virama / vowel-sign pair so transliteration
+    is one regex scan with a single dict lookup per token.
+    """
+    consonants = [c for c, t in DEVANAGARI_TO_IAST.items() if t.endswith('a') and len(t) >= 2]
+    modifiers = [c for c, t in DEVANAGARI_TO_IAST.items() if c == '्' or t in _VOWEL_SIGN_VALUES]
+    
+    table = dict(DEVANAGARI_TO_IAST)
+    for c in consonants:
+        for m in modifiers:
+            table[c + m] = DEVANAGARI_TO_IAST[c][:-1] + DEVANAGARI_TO_IAST[m]
+    
+    # A consonant with its following modifier, or any single character
+    token_re = re.compile(
+        f"[{re.escape(''.join(consonants))}][{re.escape(''.join(modifiers))}]?|.", re.DOTALL
+    )
+    return table, token_re
+
+
+_TRANSLITERATION_TABLE, _TRANSLITERATION_TOKEN_RE = _build_transliteration_table()
+
 
 def devanagari_to_transliteration(text: str) -> str:
     """Convert Devanagari to transliteration"""
-    result = []
-    i = 0
-    text = text.strip()
-    
-    while i < len(text):
-        char = text[i]
-        if char in DEVANAGARI_TO_IAST:
-            trans = DEVANAGARI_TO_IAST[char]
-            if trans and trans.endswith('a') and len(trans) >= 2:
-                if i + 1 < len(text):
-                    next_char = text[i + 1]
-                    if next_char == '्':
-                        result.append(trans[:-1])
-                        i += 2
-                        continue
-                    elif next_char in DEVANAGARI_TO_IAST and DEVANAGARI_TO_IAST[next_char] in ['A', 'i', 'I', 'u', 'U', '_r', '_R', '_l', '_L', 'e', 'E', 'o', 'O']:
-                        result.append(trans[:-1] + DEVANAGARI_TO_IAST[next_char])
-                        i += 2
-                        continue
-            result.append(trans)
-        else:
-            result.append(char)
-        i += 1
-    return ''.join(result)
+    return ''.join(
+        _TRANSLITERATION_TABLE.get(token, token)
+        for token in _TRANSLITERATION_TOKEN_RE.findall(text.strip())
+    )
 
 
 def preprocessing(text: str) -> str:
     """Preprocess text for meter analysis"""
-    prep_string = ""
-    i = 0
-    while i < len(text):
-        if text[i] in ['M', 'H']:
+    # Edit a character list in place instead of re-slicing the string per character
+    prep = []
+    for i, char in enumerate(text):
+        if char == 'M' or char == 'H':
             if i >= 2 and text[i-2] == '_':
-                prep_string = prep_string[:-2] + text[i]
+                del prep[-2:]
             elif i >= 1:
-                prep_string = prep_string[:-1] + text[i]
-            else:
-                prep_string += text[i]
-        else:
-            prep_string += text[i]
-        i += 1
-    return prep_string
+                del prep[-1:]
+        prep.append(char)
+    return ''.join(prep)
+
+
+# Meter classes for transliterated tokens: hrasva svara (L), dirgha svara (G), vyanjana (V)
+_VYANJANA = ("k", "K", "g", "G", "_n", "c", "C", "j", "J", "_N",
+             "T", "_T", "D", "_D", "N", "t", "_t", "d", "_d", "n",
+             "p", "P", "b", "B", "m", "y", "r", "l", "v", "z",
+             "S", "s", "h", "L", "R", "_L")
+_HRASVA_SVARA = ("a", "i", "u", "_r", "_l", "e", "o")
+_DIRGHA_SVARA = ("A", "I", "U", "_R", "E", "_I", "O", "_O", "M", "H")
+_LAGHU_GURU_CLASS = {
+    **dict.fromkeys(_VYANJANA, "V"),
+    **dict.fromkeys(_DIRGHA_SVARA, "G"),
+    **dict.fromkeys(_HRASVA_SVARA, "L"),
+}
+# A token is '_' plus the following character, or any single character
+_LAGHU_GURU_TOKEN_RE = re.compile(r'_.?|.', re.DOTALL)
 
 
 def laghu_guru(str_ver: str) -> str:
     """Convert verse to Laghu (L) and Guru (G) pattern"""
-    vyanjana = ["k", "K", "g", "G", "_n", "c", "C", "j", "J", "_N", 
-                "T", "_T", "D", "_D", "N", "t", "_t", "d", "_d", "n", 
-                "p", "P", "b", "B", "m", "y", "r", "l", "v", "z", 
-                "S", "s", "h", "L", "R", "_L"]
-    hrasva_svara = ["a", "i", "u", "_r", "_l", "e", "o"]
-    dirgha_svara = ["A", "I", "U", "_R", "E", "_I", "O", "_O", "M", "H"]
-    
-    la_gr = ""
-    i = 0
-    ver_len = len(str_ver)
-    
-    while i < ver_len:
-        if i < ver_len and str_ver[i] == '_':
-            str_dummy = str_ver[i:i+2]
-            i += 2
-        else:
-            str_dummy = str_ver[i]
-            i += 1
-        
-        if str_dummy in hrasva_svara:
-            la_gr += "L"
-        elif str_dummy in dirgha_svara:
-            la_gr += "G"
-        elif str_dummy in vyanjana:
-            la_gr += "V"
-    return la_gr
+    # One regex sweep tokenizes the verse; each token is classified by a single dict lookup
+    return ''.join(
+        _LAGHU_GURU_CLASS.get(token, '') for token in _LAGHU_GURU_TOKEN_RE.findall(str_ver)
+    )
 
 
 def remove_vyanjana(lg_string: str) -> str:
     """Remove consonants and adjust for clusters"""
-    lg = ""
+    lg = []
     v_count = 0
-    pos = 0
     
     for char in lg_string:
         if char == 'V':
             v_count += 1
         else:
-            if v_count >= 2 and pos >= 1:
-                lg = lg[:-1] + 'G'
+            if v_count >= 2 and lg:
+                lg[-1] = 'G'
             v_count = 0
-            lg += char
-            pos += 1
-    return lg
+            lg.append(char)
+    return ''.join(lg)
 
 
 def transcribe_audio_for_chanting(audio_bytes: bytes, language: str = 'sa') -> Tuple[str, bool]:
@@ -153,10 +165,10 @@ def transcribe_audio_for_chanting(audio_bytes: bytes, language: str = 'sa') -> T
             'response_format': 'json'
         }
         
-        response = requests.post(AudioConfig.GROQ_API_URL, headers=headers, files=files, data=data)
+        response = get_http_session().post(AudioConfig.GROQ_API_URL, headers=headers, files=files, data=data, timeout=30)
         
         if response.status_code == 200:
-            return response.json().get('text', ''), True
+            return response_json(response).get('text', ''), True
         else:
             return f"API Error: {response.status_code}", False
     except Exception as e:
@@ -169,6 +181,8 @@ def extract_pitch(audio_bytes: bytes) -> Tuple[np.ndarray, np.ndarray, int]:
         return np.array([]), np.array([]), 22050
     
     try:
+        librosa = _load_librosa()
+        
         # Load audio from bytes
         audio_io = io.BytesIO(audio_bytes)
         y, sr = librosa.load(audio_io, sr=None)
@@ -184,81 +198,95 @@ def extract_pitch(audio_bytes: bytes) -> Tuple[np.ndarray, np.ndarray, int]:
         times = librosa.times_like(f0, sr=sr)
         return times, f0, sr
     except Exception as e:
-        print(f"Pitch extraction error: {e}")
+        logger.warning("Pitch extraction error: %s", e)
         return np.array([]), np.array([]), 22050
 
 
-def get_pitch_per_syllable(audio_bytes: bytes, num_syllables: int) -> List[Dict]:
+@functools.lru_cache(maxsize=1)
+def _pitch_executor() -> ThreadPoolExecutor:
+    """Worker pool for running pitch extraction alongside transcription"""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix='pitch')
+
+
+def get_pitch_per_syllable(audio_bytes: bytes, num_syllables: int, pitch_track: Optional[Tuple] = None) -> List[Dict]:
     """Extract average pitch for each syllable segment"""
-    times, pitches, sr = extract_pitch(audio_bytes)
+    times, pitches, sr = pitch_track if pitch_track is not None else extract_pitch(audio_bytes)
     
     if len(pitches) == 0 or num_syllables == 0:
         return []
     
     segment_size = len(pitches) // num_syllables
-    syllable_pitches = []
-    
-    for i in range(num_syllables):
-        start_idx = i * segment_size
-        end_idx = (i + 1) * segment_size if i < num_syllables - 1 else len(pitches)
-        
-        segment = pitches[start_idx:end_idx]
-        valid_pitches = segment[~np.isnan(segment)]
-        
-        if len(valid_pitches) > 0:
-            avg_pitch = np.mean(valid_pitches)
-            min_pitch = np.min(valid_pitches)
-            max_pitch = np.max(valid_pitches)
-        else:
-            avg_pitch = 0
-            min_pitch = 0
-            max_pitch = 0
-        
-        syllable_pitches.append({
-            'avg': avg_pitch,
-            'min': min_pitch,
-            'max': max_pitch,
+    starts = np.arange(num_syllables) * segment_size
+    ends = np.append(starts[1:], len(pitches))
+    
+    # Reduce every segment at once; NaN (unvoiced) frames are excluded
+    avg_pitch = np.zeros(num_syllables)
+    min_pitch = np.zeros(num_syllables)
+    max_pitch = np.zeros(num_syllables)
+    nonempty = ends > starts
+    bounds = starts[nonempty]
+    voiced = ~np.isnan(pitches)
+    counts = np.add.reduceat(voiced, bounds)
+    sums = np.add.reduceat(np.where(voiced, pitches, 0.0), bounds)
+    has_voiced = counts > 0
+    avg_pitch[nonempty] = np.divide(sums, counts, out=np.zeros(len(bounds)), where=has_voiced)
+    min_pitch[nonempty] = np.where(has_voiced, np.fmin.reduceat(pitches, bounds), 0)
+    max_pitch[nonempty] = np.where(has_voiced, np.fmax.reduceat(pitches, bounds), 0)
+    
+    return [
+        {
+            'avg': avg,
+            'min': low,
+            'max': high,
             'start_time': times[start_idx] if start_idx < len(times) else 0,
             'end_time': times[end_idx - 1] if end_idx - 1 < len(times) else 0
-        })
-    
-    return syllable_pitches
-
-
-def get_pitch_direction(current_pitch: float, next_pitch: float) -> str:
-    """Determine pitch direction between syllables"""
-    if next_pitch == 0 or current_pitch == 0:
-        return "→"
-    
-    diff = next_pitch - current_pitch
-    threshold = 20
-    
-    if diff > threshold:
-        return "↗"
-    elif diff < -threshold:
-        return "↘"
-    else:
-        return "→"
+        }
+        for avg, low, high, start_idx, end_idx in zip(
+            avg_pitch.tolist(), min_pitch.tolist(), max_pitch.tolist(), starts.tolist(), ends.tolist()
+        )
+    ]
 
 
 def normalize_pitch(pitches: List[float]) -> List[float]:
     """Normalize pitch values to 0-100 scale"""
-    valid = [p for p in pitches if p > 0]
-    if not valid:
+    values = np.asarray(pitches, dtype=float)
+    voiced = values > 0
+    if not voiced.any():
         return [50] * len(pitches)
     
-    min_p = min(valid)
-    max_p = max(valid)
+    # Select the voiced frames once and take both extremes from that copy
+    voiced_values = values[voiced]
+    min_p = voiced_values.min()
+    max_p = voiced_values.max()
     range_p = max_p - min_p if max_p > min_p else 1
     
-    normalized = []
-    for p in pitches:
-        if p > 0:
-            normalized.append((p - min_p) / range_p * 100)
-        else:
-            normalized.append(50)
-    
-    return normalized
+    return np.where(voiced, (values - min_p) / range_p * 100, 50).tolist()
+
+
+# (match, instruction) and direction labels indexed by the codes compare_pitch_contours computes
+_PITCH_MATCHES = (("correct", "✓"), ("low", "↑"), ("high", "↓"))
+_PITCH_DIRECTIONS = ("↘", "→", "↗")
+# Change in Hz between consecutive syllables that counts as rising or falling
+_PITCH_DIRECTION_THRESHOLD_HZ = 20
+# Pitch feedback per score tier; bisecting the thresholds gives the tier index
+_PITCH_FEEDBACK_THRESHOLDS = (50, 70, 85)
+_PITCH_FEEDBACK = (
+    "🎵 Keep practicing! Listen carefully to the reference pitch pattern.",
+    "🎵 Moderate match. Focus on the pitch arrows and try to follow the contour.",
+    "🎵 Good pitch control! Minor adjustments needed in some syllables.",
+    "🎵 Excellent pitch matching! Your intonation closely follows the reference."
+)
+
+
+def _pitch_direction_codes(pitches: List[float]) -> np.ndarray:
+    """Direction codes (0 falling, 1 steady, 2 rising) from each pitch to the next; unvoiced (0 Hz) pairs are steady"""
+    values = np.asarray(pitches, dtype=float)
+    current = values[:-1]
+    following = values[1:]
+    step = following - current
+    voiced = (current != 0) & (following != 0)
+    return np.where(voiced & (step > _PITCH_DIRECTION_THRESHOLD_HZ), 2,
+                    np.where(voiced & (step < -_PITCH_DIRECTION_THRESHOLD_HZ), 0, 1))
 
 
 def compare_pitch_contours(ref_pitches: List[Dict], user_pitches: List[Dict]) -> Dict:
@@ -272,59 +300,56 @@ def compare_pitch_contours(ref_pitches: List[Dict], user_pitches: List[Dict]) ->
     ref_norm = normalize_pitch(ref_avg)
     user_norm = normalize_pitch(user_avg)
     
-    details = []
-    total_diff = 0
-    valid_comparisons = 0
-    
+    # Compare all syllables at once rather than one Python iteration each
     min_len = min(len(ref_norm), len(user_norm))
-    
-    for i in range(min_len):
-        ref_val = ref_norm[i]
-        user_val = user_norm[i]
-        
-        diff = abs(ref_val - user_val)
-        total_diff += diff
-        valid_comparisons += 1
-        
-        if diff < 10:
-            match = "correct"
-            instruction = "✓"
-        elif user_val < ref_val:
-            match = "low"
-            instruction = "↑"
-        else:
-            match = "high"
-            instruction = "↓"
-        
-        ref_direction = "→"
-        if i < min_len - 1:
-            ref_direction = get_pitch_direction(ref_avg[i], ref_avg[i + 1])
-        
-        details.append({
+    ref_vals = np.asarray(ref_norm[:min_len], dtype=float)
+    user_vals = np.asarray(user_norm[:min_len], dtype=float)
+    diffs = np.abs(ref_vals - user_vals)
+    matches = np.where(diffs < 10, 0, np.where(user_vals < ref_vals, 1, 2))
+    
+    # Reference direction to the next syllable (same rule as the pitch arrows)
+    directions = np.full(min_len, 1)
+    if min_len > 1:
+        directions[:-1] = _pitch_direction_codes(ref_avg[:min_len])
+    
+    details = [
+        {
             'syllable': i + 1,
             'ref_pitch': ref_avg[i],
             'user_pitch': user_avg[i],
             'diff': diff,
-            'match': match,
-            'instruction': instruction,
-            'direction': ref_direction
-        })
+            'match': _PITCH_MATCHES[match][0],
+            'instruction': _PITCH_MATCHES[match][1],
+            'direction': _PITCH_DIRECTIONS[direction]
+        }
+        for i, (diff, match, direction) in enumerate(zip(diffs.tolist(), matches.tolist(), directions.tolist()))
+    ]
     
-    avg_diff = total_diff / valid_comparisons if valid_comparisons > 0 else 100
+    avg_diff = float(diffs.mean()) if min_len > 0 else 100
     score = max(0, 100 - avg_diff)
-    
-    if score >= 85:
-        feedback = "🎵 Excellent pitch matching! Your intonation closely follows the reference."
-    elif score >= 70:
-        feedback = "🎵 Good pitch control! Minor adjustments needed in some syllables."
-    elif score >= 50:
-        feedback = "🎵 Moderate match. Focus on the pitch arrows and try to follow the contour."
-    else:
-        feedback = "🎵 Keep practicing! Listen carefully to the reference pitch pattern."
+    feedback = _PITCH_FEEDBACK[bisect.bisect_right(_PITCH_FEEDBACK_THRESHOLDS, score)]
     
     return {'score': score, 'details': details, 'feedback': feedback}
 
 
+# Devanagari character classes used to split text into syllables
+_MATRAS = frozenset('ािीुूृॄेैोौंःँ॒॑')
+_VIRAMA = '्'
+_INDEPENDENT_VOWELS = frozenset('अआइईउऊऋॠऌॡएऐओऔ')
+_EXTRA_CONSONANTS = frozenset('ळक्षज्ञ')
+# One lookup classifies each character: vowels and matras close the current
+# syllable, consonants close it unless a matra or virama follows
+_CLOSES_SYLLABLE = 1
+_CONSONANT = 2
+_SYLLABLE_CHAR_CLASS = {
+    **dict.fromkeys(map(chr, range(0x0915, 0x093A)), _CONSONANT),
+    **dict.fromkeys(_EXTRA_CONSONANTS, _CONSONANT),
+    **dict.fromkeys(_MATRAS, _CLOSES_SYLLABLE),
+    **dict.fromkeys(_INDEPENDENT_VOWELS, _CLOSES_SYLLABLE),
+}
+_MATRA_OR_VIRAMA = _MATRAS | {_VIRAMA}
+
+
 def get_syllable_character_mapping(original_text: str, lg_pattern: str, is_devanagari: bool) -> List[Dict]:
     """Map each syllable to its Devanagari character(s) and meter"""
     syllables = []
@@ -339,34 +364,20 @@ def get_syllable_character_mapping(original_text: str, lg_pattern: str, is_devan
         return syllables
     
     text = original_text.replace(' ', '')
-    matras = set('ािीुूृॄेैोौंःँ॒॑')
-    virama = '्'
-    vowels = set('अआइईउऊऋॠऌॡएऐओऔ')
     
     i = 0
     syllable_idx = 0
     current_syllable = ""
     
-    while i < len(text) and syllable_idx < len(lg_pattern):
+    text_len = len(text)
+    while i < text_len and syllable_idx < len(lg_pattern):
         char = text[i]
         current_syllable += char
         
-        is_vowel = char in vowels
-        is_matra = char in matras
-        is_consonant = '\u0915' <= char <= '\u0939' or char in 'ळक्षज्ञ'
-        
-        next_char = text[i + 1] if i + 1 < len(text) else None
-        next_is_matra = next_char in matras if next_char else False
-        next_is_virama = next_char == virama if next_char else False
-        
-        syllable_complete = False
-        
-        if is_vowel:
-            syllable_complete = True
-        elif is_matra:
-            syllable_complete = True
-        elif is_consonant and not next_is_matra and not next_is_virama:
-            syllable_complete = True
+        char_class = _SYLLABLE_CHAR_CLASS.get(char)
+        syllable_complete = char_class == _CLOSES_SYLLABLE or (
+            char_class == _CONSONANT and (i + 1 == text_len or text[i + 1] not in _MATRA_OR_VIRAMA)
+        )
         
         if syllable_complete and syllable_idx < len(lg_pattern):
             lg = lg_pattern[syllable_idx]
@@ -392,9 +403,18 @@ def get_syllable_character_mapping(original_text: str, lg_pattern: str, is_devan
     return syllables
 
 
-def analyze_text(text: str) -> Dict:
-    """Analyze Sanskrit text for meter"""
-    if any(ord(c) >= 0x0900 and ord(c) <= 0x097F for c in text):
+# Verse separators dropped and line breaks turned into spaces, in one translate() pass
+_VERSE_CLEANUP = str.maketrans({'|': None, '।': None, '॥': None, '\n': ' '})
+# Padas are fixed-size slices of the verse's full laghu-guru pattern
+_SYLLABLES_PER_PADA = 8
+_DEVANAGARI_RE = re.compile('[\u0900-\u097F]')
+
+
+@functools.lru_cache(maxsize=128)
+def _verse_meter(text: str) -> Tuple[str, str, bool]:
+    """Return (cleaned original text, full laghu-guru pattern, is Devanagari) for a verse"""
+    # ASCII transcripts are ruled out by isascii(); otherwise the regex scans in C
+    if not text.isascii() and _DEVANAGARI_RE.search(text):
         transliterated = devanagari_to_transliteration(text)
         is_devanagari = True
         original_text = text
@@ -403,18 +423,31 @@ def analyze_text(text: str) -> Dict:
         is_devanagari = False
         original_text = text
     
-    clean_trans = transliterated.replace('|', '').replace('।', '').replace('॥', '').replace('\n', ' ')
-    clean_orig = original_text.replace('|', '').replace('।', '').replace('॥', '').replace('\n', ' ')
+    clean_trans = transliterated.translate(_VERSE_CLEANUP)
+    clean_orig = original_text.translate(_VERSE_CLEANUP)
     
     prep = preprocessing(clean_trans)
     str_verse = prep.replace(' ', '')
     lg = laghu_guru(str_verse)
     lg_full = remove_vyanjana(lg)
     
+    return clean_orig, lg_full, is_devanagari
+
+
+def analyze_text(text: str) -> Dict:
+    """Analyze Sanskrit text for meter"""
+    # Silent or failed recordings transcribe to blank text, which has no syllables
+    if not text or text.isspace():
+        return {'text': text, 'laghu_guru': '', 'padas': [], 'total_syllables': 0}
+    
+    # The string stages are memoized per transcript (the same reference verse is
+    # analyzed repeatedly); the syllable and pada dicts are built fresh each call
+    clean_orig, lg_full, is_devanagari = _verse_meter(text)
+    
     syllable_chars = get_syllable_character_mapping(clean_orig, lg_full, is_devanagari)
     
     padas = []
-    syllables_per_pada = 8
+    syllables_per_pada = _SYLLABLES_PER_PADA
     
     total_syllables = len(lg_full)
     num_padas = (total_syllables + syllables_per_pada - 1) // syllables_per_pada
@@ -433,12 +466,13 @@ def analyze_text(text: str) -> Dict:
             'syllables': len(pada_lg)
         })
     
-    return {'text': text, 'padas': padas, 'total_syllables': total_syllables}
+    return {'text': text, 'laghu_guru': lg_full, 'padas': padas, 'total_syllables': total_syllables}
 
 
 def create_pitch_contour_chart(ref_pitches: List[Dict], user_pitches: List[Dict] = None):
     """Create pitch contour visualization using matplotlib"""
-    if not HAS_MATPLOTLIB:
+    plt = _load_pyplot() if HAS_MATPLOTLIB else None
+    if plt is None:
         return None
     
     fig, ax = plt.subplots(figsize=(10, 4))
@@ -479,11 +513,16 @@ def render_meter_visualization(analysis: Dict, pitch_data: List[Dict] = None):
         st.warning("No text to analyze")
         return
     
-    # Flatten syllables for pitch mapping
-    all_syllables = []
-    for pada in padas:
-        all_syllables.extend(pada.get('syllable_chars', []))
-    
+    # Syllables are numbered across padas while rendering, so the pitch data
+    # is indexed in the same pass instead of flattening the padas first.
+    # Every arrow is worked out up front in one vectorized step; the last
+    # syllable with pitch data has no successor and gets a dot.
+    pitch_count = len(pitch_data) if pitch_data else 0
+    pitch_arrows = []
+    if pitch_count:
+        codes = _pitch_direction_codes([p['avg'] for p in pitch_data])
+        pitch_arrows = [_PITCH_DIRECTIONS[code] for code in codes.tolist()]
+        pitch_arrows.append("●")
     global_syl_idx = 0
     
     for pada in padas:
@@ -503,15 +542,7 @@ def render_meter_visualization(analysis: Dict, pitch_data: List[Dict] = None):
         for idx, syl in enumerate(syllable_chars):
             col_idx = idx % len(cols)
             
-            pitch_arrow = ""
-            if pitch_data and global_syl_idx < len(pitch_data):
-                if global_syl_idx < len(pitch_data) - 1:
-                    pitch_arrow = get_pitch_direction(
-                        pitch_data[global_syl_idx]['avg'],
-                        pitch_data[global_syl_idx + 1]['avg']
-                    )
-                else:
-                    pitch_arrow = "●"
+            pitch_arrow = pitch_arrows[global_syl_idx] if global_syl_idx < pitch_count else ""
             
             meter_color = "#ff6b6b" if syl['lg'] == 'G' else "#00ff88"
             
@@ -577,31 +608,57 @@ def render_comparison_scores(meter_score: float, pitch_score: float, combined_sc
 
 def compare_meters(ref_analysis: Dict, user_analysis: Dict) -> float:
     """Compare meter patterns and return score"""
-    ref_padas = ref_analysis['padas']
-    user_padas = user_analysis['padas']
+    # Padas line up at the same offsets in both full patterns, so one pass over
+    # the full patterns scores every pada at once. Only padas present in both
+    # recitations count: each is scored over its longer side, which caps the
+    # total at the padas spanned by the shorter pattern.
+    ref_lg = ref_analysis.get('laghu_guru')
+    if ref_lg is None:
+        ref_lg = ''.join(pada['laghu_guru'] for pada in ref_analysis['padas'])
+    user_lg = user_analysis.get('laghu_guru')
+    if user_lg is None:
+        user_lg = ''.join(pada['laghu_guru'] for pada in user_analysis['padas'])
+    
+    shared_padas = -(-min(len(ref_lg), len(user_lg)) // _SYLLABLES_PER_PADA)
+    total_syllables = min(max(len(ref_lg), len(user_lg)), shared_padas * _SYLLABLES_PER_PADA)
+    # map() stops at the shorter pattern and compares in C
+    matching_syllables = sum(map(operator.eq, ref_lg, user_lg))
     
-    total_syllables = 0
-    matching_syllables = 0
+    return (matching_syllables / total_syllables * 100) if total_syllables > 0 else 0
+
+
+def analyze_chanting(audio_bytes: bytes) -> Tuple[str, bool, Optional[Dict], Optional[List[Dict]]]:
+    """
+    Transcribe and analyze a chanting recording.
     
-    max_padas = max(len(ref_padas), len(user_padas))
+    Pitch tracking only needs the audio, so it runs on a worker thread while
+    the transcription request is in flight; the syllable count from the
+    transcript is applied to the finished pitch track afterwards.
     
-    for i in range(max_padas):
-        ref = ref_padas[i] if i < len(ref_padas) else None
-        user = user_padas[i] if i < len(user_padas) else None
-        
-        if ref and user:
-            ref_lg = ref['laghu_guru']
-            user_lg = user['laghu_guru']
-            
-            min_len = min(len(ref_lg), len(user_lg))
-            max_len = max(len(ref_lg), len(user_lg))
-            
-            matches = sum(1 for j in range(min_len) if ref_lg[j] == user_lg[j])
-            
-            total_syllables += max_len
-            matching_syllables += matches
+    Returns:
+        Tuple of (transcript, success, meter analysis, per-syllable pitch or
+        None when pitch could not be tracked)
+    """
+    pitch_future = _pitch_executor().submit(extract_pitch, audio_bytes) if HAS_LIBROSA else None
+    transcript, success = transcribe_audio_for_chanting(audio_bytes, 'sa')
     
-    return (matching_syllables / total_syllables * 100) if total_syllables > 0 else 0
+    if not success:
+        if pitch_future is not None:
+            pitch_future.cancel()
+        return transcript, False, None, None
+    
+    analysis = analyze_text(transcript)
+    pitch = None
+    total_syl = analysis.get('total_syllables', 0)
+    if total_syl > 0 and pitch_future is not None:
+        pitch = get_pitch_per_syllable(audio_bytes, total_syl, pitch_future.result())
+    
+    return transcript, True, analysis, pitch
+
+
+# Share of the combined score taken by meter and pitch when both are available
+_METER_SCORE_WEIGHT = 0.6
+_PITCH_SCORE_WEIGHT = 0.4
 
 
 def render_advanced_chanting():
@@ -695,17 +752,13 @@ def render_advanced_chanting():
         
         if ref_audio_bytes and st.button("🔍 Analyze Reference", type="primary", key="analyze_ref"):
             with st.spinner("Transcribing and analyzing..."):
-                # Transcribe
-                transcript, success = transcribe_audio_for_chanting(ref_audio_bytes, 'sa')
+                transcript, success, analysis, pitch = analyze_chanting(ref_audio_bytes)
                 
                 if success:
                     st.session_state.adv_reference_audio = ref_audio_bytes
-                    st.session_state.adv_reference_analysis = analyze_text(transcript)
-                    
-                    # Extract pitch
-                    total_syl = st.session_state.adv_reference_analysis.get('total_syllables', 0)
-                    if total_syl > 0 and HAS_LIBROSA:
-                        st.session_state.adv_reference_pitch = get_pitch_per_syllable(ref_audio_bytes, total_syl)
+                    st.session_state.adv_reference_analysis = analysis
+                    if pitch is not None:
+                        st.session_state.adv_reference_pitch = pitch
                     
                     st.success(f"✓ Transcribed: {transcript[:100]}...")
                 else:
@@ -749,14 +802,12 @@ def render_advanced_chanting():
         
         if user_audio_bytes and st.button("🔍 Analyze My Chanting", type="primary", key="analyze_user"):
             with st.spinner("Transcribing and analyzing..."):
-                transcript, success = transcribe_audio_for_chanting(user_audio_bytes, 'sa')
+                transcript, success, analysis, pitch = analyze_chanting(user_audio_bytes)
                 
                 if success:
-                    st.session_state.adv_user_analysis = analyze_text(transcript)
-                    
-                    total_syl = st.session_state.adv_user_analysis.get('total_syllables', 0)
-                    if total_syl > 0 and HAS_LIBROSA:
-                        st.session_state.adv_user_pitch = get_pitch_per_syllable(user_audio_bytes, total_syl)
+                    st.session_state.adv_user_analysis = analysis
+                    if pitch is not None:
+                        st.session_state.adv_user_pitch = pitch
                     
                     st.success(f"✓ Transcribed: {transcript[:100]}...")
                 else:
@@ -791,7 +842,9 @@ def render_advanced_chanting():
             )
             pitch_score = pitch_comparison['score']
         
-        combined_score = (meter_score * 0.6 + pitch_score * 0.4) if pitch_comparison else meter_score
+        combined_score = (
+            meter_score * _METER_SCORE_WEIGHT + pitch_score * _PITCH_SCORE_WEIGHT
+        ) if pitch_comparison else meter_score
         
         # Render scores
         render_comparison_scores(meter_score, pitch_score, combined_score)
@@ -805,7 +858,7 @@ def render_advanced_chanting():
             )
             if fig:
                 st.pyplot(fig)
-                plt.close(fig)
+                _load_pyplot().close(fig)
         
         # Pitch feedback
         if pitch_comparison:
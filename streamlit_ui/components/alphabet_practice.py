@@ -173,8 +173,7 @@ def render_alphabet_practice():
                     
                     # Compare with expected alphabet
                     from utils.text_processor import TextProcessor
-                    text_processor = TextProcessor()
-                    similarity = text_processor.calculate_similarity(devanagari, user_said)
+                    similarity = TextProcessor.calculate_similarity(devanagari, user_said)
                     accuracy = similarity * 100
                     
                     # Record the attempt
@@ -267,9 +266,10 @@ def render_alphabet_practice():
             st.session_state.practice_mode = 'full'
             st.rerun()
     
-    # Check for category completion
+    # Check for category completion (scores only change before a rerun, so the
+    # progress count taken above is still current)
     if st.session_state.alphabet_result and st.session_state.alphabet_result['passed']:
-        if count_completed_alphabets() == len(alphabets):
+        if completed == total:
             st.balloons()
             st.success(f"🌟 Congratulations! You've completed all {category_name}!")
             
@@ -82,6 +82,8 @@ def render_full_shloka_practice():
             audio_bytes = audio_value.read()
             st.session_state.uploaded_audio = audio_bytes
             st.session_state.recording_state = 'recorded'
+            # Transcribe the reference audio while the user reviews the take
+            get_backend().prefetch_original(st.session_state.current_shloka)
             
             st.markdown("""
                 <div style="text-align: center; margin-top: 12px; padding: 10px; 
@@ -106,6 +108,7 @@ def render_full_shloka_practice():
         if uploaded_file is not None:
             st.session_state.uploaded_audio = uploaded_file.read()
             st.session_state.recording_state = 'uploaded'
+            get_backend().prefetch_original(st.session_state.current_shloka)
             st.success("✓ File ready", icon="✅")
     
     # Compact analysis button
@@ -158,8 +161,7 @@ def analyze_pronunciation():
             pronunciation_score=analysis_results['accuracy'],
             llm_feedback=str(analysis_results.get('llm_feedback', {})),
             word_comparison=analysis_results.get('incorrect_words', []),
-            practice_mode=st.session_state.practice_mode,
-            passed=analysis_results.get('passed', False)
+            practice_mode=st.session_state.practice_mode
         )
         
         st.session_state.analysis_results = analysis_results
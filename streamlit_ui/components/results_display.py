@@ -102,17 +102,15 @@ def render_results_display():
                     </div>
                 """, unsafe_allow_html=True)
             
-            # Practice tips
+            # Practice tips (rendered as one markdown element instead of one per tip)
             if feedback.get('practice_tips'):
-                st.markdown("""
-                    <div style="font-size: 0.85rem; color: #94a3b8; margin-top: 8px;">
-                        <strong>Practice Tips:</strong>
-                    </div>
-                """, unsafe_allow_html=True)
-                for tip in feedback.get('practice_tips', []):
-                    st.markdown(f"""
-                        <div style="font-size: 0.85rem; color: #94a3b8; padding-left: 12px;">
-                            • {tip}
-                        </div>
-                    """, unsafe_allow_html=True)
+                tips_html = [
+                    '<div style="font-size: 0.85rem; color: #94a3b8; margin-top: 8px;">'
+                    '<strong>Practice Tips:</strong></div>'
+                ]
+                tips_html.extend(
+                    f'<div style="font-size: 0.85rem; color: #94a3b8; padding-left: 12px;">• {tip}</div>'
+                    for tip in feedback['practice_tips']
+                )
+                st.markdown("\n".join(tips_html), unsafe_allow_html=True)
 
@@ -228,24 +228,23 @@ def render_word_practice():
                     
                     # Use the SAME text processor and alignment logic as full shloka
                     from utils.text_processor import TextProcessor
-                    text_processor = TextProcessor()
                     
                     # Split both into words
-                    original_words = text_processor.smart_word_split(original_shloka_word)
-                    user_words = text_processor.smart_word_split(user_said)
+                    original_words = TextProcessor.smart_word_split(original_shloka_word)
+                    user_words = TextProcessor.smart_word_split(user_said)
                     
                     # Align words (same as full shloka analysis)
-                    word_results = text_processor.align_words(original_words, user_words, [])
+                    word_results = TextProcessor.align_words(original_words, user_words)
                     
                     # Calculate accuracy based on alignment
                     if word_results and len(word_results) > 0:
                         # Get the first word result (since we're practicing one word)
                         first_result = word_results[0]
-                        accuracy = first_result['similarity'] * 100
-                        is_correct = first_result['correct']
+                        accuracy = first_result.similarity * 100
+                        is_correct = first_result.correct
                     else:
                         # Fallback to simple similarity
-                        similarity = text_processor.calculate_similarity(original_shloka_word, user_said)
+                        similarity = TextProcessor.calculate_similarity(original_shloka_word, user_said)
                         accuracy = similarity * 100
                         is_correct = accuracy >= 70
                     
@@ -0,0 +1,377 @@
+"""
+Tests for the Gemini feedback generator.
+
+Gemini is replaced by a fake client, so no network access or API key is needed.
+"""
+import dataclasses
+import json
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from core.config import AnalysisConfig
+from analysis import feedback_generator
+from analysis.feedback_generator import FeedbackGenerator, _CachedFeedback, _DiskResponseCache, _ResponseCache
+
+
+REPLY = {'feedback': 'Watch the conjuncts.', 'motivation': 'Nearly there!', 'tips': ['Slow down', 'Breathe']}
+
+
+def _analysis(accuracy=62.5, words=('धर्मक्षेत्रे', 'कुरुक्षेत्रे')):
+    return {
+        'accuracy': accuracy,
+        'correct_count': 5,
+        'total_count': 8,
+        'incorrect_words': [{'original': word, 'user': ''} for word in words]
+    }
+
+
+class FakeModels:
+    """Stands in for client.models, returning canned text or raising"""
+    
+    def __init__(self, text=json.dumps(REPLY), error=None):
+        self.text = text
+        self.error = error
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+    
+    def generate_content(self, model, contents, config=None):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return SimpleNamespace(text=self.text)
+
+
+class GeneratorTestCase(unittest.TestCase):
+    """Builds a generator wired to a fake client, with the disk cache in a temp dir"""
+    
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(AnalysisConfig, 'FEEDBACK_DISK_CACHE_PATH', Path(tmp.name) / 'cache.db')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        self.models = FakeModels()
+        self.generator = self._generator(self.models)
+        self.addCleanup(self._flush_disk_cache)
+    
+    def _generator(self, models):
+        generator = FeedbackGenerator()
+        generator.client = SimpleNamespace(models=models)
+        generator.model_name = 'test-model'
+        generator.initialized = True
+        return generator
+    
+    def _flush_disk_cache(self):
+        if self.generator._disk_cache is not None:
+            self.generator._disk_cache.flush()
+
+
+class CachedFeedbackTest(unittest.TestCase):
+    """Cached feedback is stored as compact, immutable records"""
+    
+    def test_record_is_slotted_and_frozen(self):
+        record = _CachedFeedback.from_feedback(
+            {'feedback': 'Good.', 'motivation': 'Go on!', 'practice_tips': ['Slow down']}
+        )
+        self.assertFalse(hasattr(record, '__dict__'))
+        self.assertEqual(record.practice_tips, ('Slow down',))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            record.feedback = 'changed'
+    
+    def test_as_feedback_returns_a_fresh_dict(self):
+        record = _CachedFeedback('Good.', 'Go on!', ('Slow down',))
+        feedback = record.as_feedback()
+        feedback['practice_tips'].append('mutated')
+        self.assertEqual(record.as_feedback()['practice_tips'], ['Slow down'])
+
+
+class ResponseCacheTest(unittest.TestCase):
+    """In-memory LRU cache with a per-entry TTL"""
+    
+    def test_evicts_least_recently_used(self):
+        cache = _ResponseCache(max_entries=2, ttl_seconds=60)
+        for key in ('a', 'b'):
+            cache.put(key, _CachedFeedback(key, key, ()))
+        cache.get('a')
+        cache.put('c', _CachedFeedback('c', 'c', ()))
+        
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a').feedback, 'a')
+    
+    def test_entries_expire(self):
+        cache = _ResponseCache(max_entries=2, ttl_seconds=60)
+        with mock.patch.object(feedback_generator.time, 'monotonic', return_value=1000.0):
+            cache.put('a', _CachedFeedback('a', 'a', ()))
+        with mock.patch.object(feedback_generator.time, 'monotonic', return_value=1061.0):
+            self.assertIsNone(cache.get('a'))
+
+
+class CacheTest(GeneratorTestCase):
+    """Repeated analyses are answered from the cache instead of Gemini"""
+    
+    def test_repeat_analysis_is_served_from_cache(self):
+        first = self.generator.generate_feedback(_analysis())
+        second = self.generator.generate_feedback(_analysis())
+        
+        self.assertEqual(self.models.calls, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(first['practice_tips'], ['Slow down', 'Breathe'])
+        self.assertEqual(self.generator.cache_hits, 1)
+        # Callers get their own copy
+        second['practice_tips'].append('mutated')
+        self.assertNotIn('mutated', self.generator.generate_feedback(_analysis())['practice_tips'])
+    
+    def test_different_words_call_gemini_again(self):
+        self.generator.generate_feedback(_analysis())
+        self.generator.generate_feedback(_analysis(words=('मामकाः', 'पाण्डवाश्चैव')))
+        self.assertEqual(self.models.calls, 2)
+    
+    def test_perfect_attempt_skips_gemini(self):
+        perfect = _analysis(accuracy=100.0, words=())
+        self.assertEqual(self.generator.generate_feedback(perfect), feedback_generator.simple_feedback(perfect))
+        self.assertEqual(self.models.calls, 0)
+
+
+class DiskResponseCacheTest(GeneratorTestCase):
+    """SQLite cache that survives restarts and never breaks feedback when unusable"""
+    
+    def test_round_trip_and_expiry(self):
+        path = AnalysisConfig.FEEDBACK_DISK_CACHE_PATH
+        record = _CachedFeedback('text', 'keep going', ('tip',))
+        cache = _DiskResponseCache(path, ttl_seconds=60)
+        cache.put('key', record)
+        self.assertTrue(cache.flush())
+        self.assertEqual(cache.get('key'), record)
+        self.assertIsNone(_DiskResponseCache(path, ttl_seconds=-1).get('key'))
+    
+    def test_survives_a_new_generator(self):
+        self.generator.generate_feedback(_analysis())
+        self.generator._disk_cache.flush()
+        
+        restarted = self._generator(FakeModels(error=RuntimeError('offline')))
+        self.assertEqual(restarted.generate_feedback(_analysis())['feedback'], REPLY['feedback'])
+    
+    def test_unwritable_path_disables_the_cache(self):
+        # A regular file where the cache directory should be makes mkdir fail
+        blocker = AnalysisConfig.FEEDBACK_DISK_CACHE_PATH.parent / 'blocker'
+        blocker.write_text('')
+        with mock.patch.object(AnalysisConfig, 'FEEDBACK_DISK_CACHE_PATH', blocker / 'cache.db'), \
+                self.assertLogs(feedback_generator.logger, 'WARNING'):
+            generator = self._generator(self.models)
+        
+        self.assertFalse(generator._disk_cache.available)
+        self.assertEqual(generator.generate_feedback(_analysis())['feedback'], REPLY['feedback'])
+    
+    def test_writer_connect_failure_drains_queued_writes(self):
+        cache = _DiskResponseCache(AnalysisConfig.FEEDBACK_DISK_CACHE_PATH, ttl_seconds=60)
+        with mock.patch.object(cache, '_connect', side_effect=sqlite3.OperationalError('locked')), \
+                self.assertLogs(feedback_generator.logger, 'WARNING'):
+            cache.put('key', _CachedFeedback('text', 'keep going', ()))
+            self.assertTrue(cache.flush(timeout=5))
+        self.assertFalse(cache.available)
+    
+    def test_flush_wait_is_bounded(self):
+        cache = _DiskResponseCache(AnalysisConfig.FEEDBACK_DISK_CACHE_PATH, ttl_seconds=60)
+        cache._write_queue.put(('key', 0.0, '{}'))  # No writer thread to store it
+        with self.assertLogs(feedback_generator.logger, 'WARNING'):
+            self.assertFalse(cache.flush(timeout=0.05))
+
+
+class InFlightTest(GeneratorTestCase):
+    """Identical concurrent requests share one Gemini call"""
+    
+    def _run_concurrently(self):
+        """Start a second identical request while the first is waiting on Gemini"""
+        joined = threading.Event()
+        claim = self.generator._claim_in_flight
+        
+        def claim_and_signal(cache_key):
+            future, owner = claim(cache_key)
+            if not owner:
+                joined.set()
+            return future, owner
+        
+        results = [None, None]
+        
+        def run(i):
+            results[i] = self.generator.generate_feedback(_analysis())
+        
+        self.models.release.clear()
+        with mock.patch.object(self.generator, '_claim_in_flight', side_effect=claim_and_signal):
+            first = threading.Thread(target=run, args=(0,))
+            first.start()
+            self.assertTrue(self.models.started.wait(5))
+            second = threading.Thread(target=run, args=(1,))
+            second.start()
+            self.assertTrue(joined.wait(5))
+            self.models.release.set()
+            first.join(5)
+            second.join(5)
+        return results
+    
+    def test_identical_requests_share_one_call(self):
+        first, second = self._run_concurrently()
+        
+        self.assertEqual(self.models.calls, 1)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual(self.generator._in_flight, {})
+    
+    def test_failed_call_falls_back_for_every_waiter(self):
+        self.models.error = RuntimeError('boom')
+        with self.assertLogs(feedback_generator.logger, 'WARNING'):
+            first, second = self._run_concurrently()
+        
+        self.assertEqual(first, feedback_generator.simple_feedback(_analysis()))
+        self.assertEqual(second, feedback_generator.simple_feedback(_analysis()))
+        self.assertEqual(self.generator._in_flight, {})
+    
+    def test_wait_outlasts_the_owners_retries(self):
+        with mock.patch.object(AnalysisConfig, 'LLM_TIMEOUT', 30), \
+                mock.patch.object(AnalysisConfig, 'LLM_FEEDBACK_RETRY_LIMIT', 2):
+            self.assertEqual(feedback_generator._in_flight_wait_seconds(), 30 * 3 + 1 + 2)
+
+
+class RetryTest(GeneratorTestCase):
+    """Transient Gemini errors are retried with backoff; the client has a request timeout"""
+    
+    def _replies(self, *replies):
+        """Make Gemini raise or return each reply in turn"""
+        replies = list(replies)
+        
+        def generate_content(model, contents, config=None):
+            self.models.calls += 1
+            reply = replies.pop(0)
+            if isinstance(reply, Exception):
+                raise reply
+            return reply
+        
+        self.models.generate_content = generate_content
+    
+    @staticmethod
+    def _error(code):
+        error = RuntimeError('HTTP %d' % code)
+        error.code = code
+        return error
+    
+    def test_transient_errors_are_retried(self):
+        self._replies(self._error(503), SimpleNamespace(text=json.dumps(REPLY)))
+        with mock.patch.object(feedback_generator.time, 'sleep') as sleep:
+            feedback = self.generator.generate_feedback(_analysis())
+        self.assertEqual(feedback['feedback'], REPLY['feedback'])
+        self.assertEqual(self.models.calls, 2)
+        self.assertEqual(sleep.call_count, 1)
+    
+    def test_gives_up_after_the_retry_limit(self):
+        self._replies(*[self._error(429)] * (AnalysisConfig.LLM_FEEDBACK_RETRY_LIMIT + 1))
+        with mock.patch.object(feedback_generator.time, 'sleep'), \
+                self.assertLogs(feedback_generator.logger, 'WARNING'):
+            feedback = self.generator.generate_feedback(_analysis())
+        self.assertEqual(feedback, feedback_generator.simple_feedback(_analysis()))
+        self.assertEqual(self.models.calls, AnalysisConfig.LLM_FEEDBACK_RETRY_LIMIT + 1)
+    
+    def test_client_errors_are_not_retried(self):
+        self._replies(self._error(400))
+        with mock.patch.object(feedback_generator.time, 'sleep') as sleep, \
+                self.assertLogs(feedback_generator.logger, 'WARNING'):
+            self.generator.generate_feedback(_analysis())
+        self.assertEqual(self.models.calls, 1)
+        sleep.assert_not_called()
+    
+    def test_client_uses_the_request_timeout(self):
+        genai = mock.Mock()
+        feedback_generator._get_client.cache_clear()
+        self.addCleanup(feedback_generator._get_client.cache_clear)
+        with mock.patch.object(feedback_generator, '_load_genai', return_value=genai), \
+                mock.patch.object(AnalysisConfig, 'GEMINI_API_KEY', 'test-key'):
+            self.assertTrue(FeedbackGenerator.__new__(FeedbackGenerator)._initialize_client())
+        genai.Client.assert_called_once_with(
+            api_key='test-key', http_options={'timeout': AnalysisConfig.LLM_TIMEOUT * 1000}
+        )
+
+
+class SimilarFeedbackTest(GeneratorTestCase):
+    """Near-duplicate analyses reuse stored Gemini feedback only when enabled"""
+    
+    def test_near_duplicate_calls_gemini_by_default(self):
+        self.assertFalse(AnalysisConfig.SIMILAR_FEEDBACK_ENABLED)
+        self.generator.generate_feedback(_analysis(accuracy=62.5))
+        self.generator.generate_feedback(_analysis(accuracy=63.0))
+        self.assertEqual(self.models.calls, 2)
+    
+    def test_near_duplicate_gets_stored_gemini_feedback_when_enabled(self):
+        with mock.patch.object(AnalysisConfig, 'SIMILAR_FEEDBACK_ENABLED', True):
+            first = self.generator.generate_feedback(_analysis(accuracy=62.5))
+            near = self.generator.generate_feedback(_analysis(accuracy=63.0))
+        
+        self.assertEqual(self.models.calls, 1)
+        self.assertEqual(near, first)
+        self.assertEqual(near['feedback'], REPLY['feedback'])
+    
+    def test_near_duplicate_entries_expire(self):
+        index = feedback_generator._SimilarFeedbackIndex(8, 0.8, 5.0, ttl_seconds=60)
+        record = _CachedFeedback('text', 'keep going', ())
+        with mock.patch.object(feedback_generator.time, 'monotonic', return_value=1000.0):
+            index.put('key', _analysis(accuracy=62.5), 'beginner', record)
+            self.assertEqual(index.get(_analysis(accuracy=63.0), 'beginner'), record)
+        with mock.patch.object(feedback_generator.time, 'monotonic', return_value=1061.0):
+            self.assertIsNone(index.get(_analysis(accuracy=63.0), 'beginner'))
+        self.assertEqual(index._order, {})
+
+
+class ParseResponseTest(unittest.TestCase):
+    """Structured replies, with the labelled-text fallback"""
+    
+    def setUp(self):
+        self.generator = FeedbackGenerator.__new__(FeedbackGenerator)
+    
+    def test_json_reply(self):
+        feedback = self.generator._parse_json_response(json.dumps(REPLY), 62.5)
+        self.assertEqual(feedback, {
+            'feedback': 'Watch the conjuncts.',
+            'motivation': 'Nearly there!',
+            'practice_tips': ['Slow down', 'Breathe']
+        })
+    
+    def test_json_reply_without_tips_uses_defaults(self):
+        feedback = self.generator._parse_json_response(json.dumps({'feedback': 'Good.', 'tips': ' '}), 95)
+        self.assertEqual(feedback['motivation'], 'Keep practicing!')
+        self.assertEqual(feedback['practice_tips'], feedback_generator.default_tips(95))
+    
+    def test_single_tip_string(self):
+        feedback = self.generator._parse_json_response(json.dumps({'feedback': 'Good.', 'tips': 'Relax'}), 80)
+        self.assertEqual(feedback['practice_tips'], ['Relax'])
+    
+    def test_labelled_text_fallback(self):
+        text = (
+            "Here you go.\n"
+            "FEEDBACK: Solid attempt.\nWatch the visarga.\n"
+            "MOTIVATION: Keep it up!\n"
+            "TIPS:\n- Open the mouth\n2. Breathe from the diaphragm\n• Slow down\n"
+        )
+        self.assertEqual(self.generator._parse_json_response(text, 62.5), {
+            'feedback': 'Solid attempt. Watch the visarga.',
+            'motivation': 'Keep it up!',
+            'practice_tips': ['Open the mouth', 'Breathe from the diaphragm', 'Slow down']
+        })
+    
+    def test_unlabelled_text_gets_defaults(self):
+        self.assertEqual(self.generator._parse_json_response('no labels here', 50), {
+            'feedback': 'Great effort!',
+            'motivation': 'Keep practicing!',
+            'practice_tips': feedback_generator.default_tips(50)
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+"""
+Tests for the shared HTTP session's retry policy.
+"""
+import unittest
+
+from urllib3.exceptions import MaxRetryError, ProtocolError
+
+from utils.http_session import get_http_session
+
+
+class RetryPolicyTest(unittest.TestCase):
+    """Stale keep-alive sockets are retried once; Retry-After cannot stall a run"""
+    
+    def setUp(self):
+        self.retries = get_http_session().get_adapter('https://api.groq.com').max_retries
+    
+    def test_reset_keep_alive_socket_is_retried_once(self):
+        reset = ProtocolError('Connection aborted.', ConnectionResetError())
+        retried = self.retries.increment(method='POST', error=reset)
+        with self.assertRaises(MaxRetryError):
+            retried.increment(method='POST', error=reset)
+    
+    def test_retry_after_header_is_not_honoured(self):
+        self.assertFalse(self.retries.respect_retry_after_header)
+        self.assertIn(429, self.retries.status_forcelist)
+
+
+if __name__ == '__main__':
+    unittest.main()
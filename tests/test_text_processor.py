@@ -0,0 +1,98 @@
+"""
+Regression tests for word similarity scoring.
+
+Word, shloka and alphabet grading (and the scores saved to practice history)
+all depend on calculate_similarity, so its values are pinned here.
+"""
+import unittest
+from unittest import mock
+
+from core.config import AnalysisConfig
+from utils.text_processor import TextProcessor
+
+
+class CalculateSimilarityTest(unittest.TestCase):
+    """calculate_similarity keeps difflib's Ratcliff/Obershelp ratio"""
+    
+    # (original, spoken, matched characters, total characters)
+    PINNED = [
+        ('मामकाः', 'मकामा', 3, 11),  # LCS-based ratios give 8/11 and pass this pair
+        ('धर्मक्षेत्रे', 'धर्मक्षत्रे', 11, 23),
+        ('कुरुक्षेत्रे', 'कुरुक्षेत्र', 11, 23),
+        ('समवेता', 'समवेताः', 6, 13),
+        ('युयुत्सवः', 'युयुत्सव', 8, 17),
+        ('पाण्डवाश्चैव', 'पाण्डवाश्च', 10, 22),
+        ('सञ्जय', 'संजय', 3, 9),
+        ('abcab', 'bacba', 3, 10),
+    ]
+    
+    def test_pinned_scores(self):
+        for original, spoken, matches, total in self.PINNED:
+            with self.subTest(original=original, spoken=spoken):
+                self.assertAlmostEqual(
+                    TextProcessor.calculate_similarity(original, spoken),
+                    2 * matches / total
+                )
+    
+    def test_identical_and_case_insensitive(self):
+        self.assertEqual(TextProcessor.calculate_similarity('किमकुर्वत', 'किमकुर्वत'), 1.0)
+        self.assertEqual(TextProcessor.calculate_similarity('Dharma', 'dharma'), 1.0)
+    
+    def test_empty_words_score_zero(self):
+        self.assertEqual(TextProcessor.calculate_similarity('', 'धर्म'), 0.0)
+        self.assertEqual(TextProcessor.calculate_similarity('धर्म', ''), 0.0)
+
+
+class AlignWordsTest(unittest.TestCase):
+    """align_words grades each position against WORD_SIMILARITY_THRESHOLD"""
+    
+    def test_verdicts(self):
+        results = TextProcessor.align_words(
+            ['धर्मक्षेत्रे', 'मामकाः', 'पाण्डवाश्चैव'],
+            ['धर्मक्षत्रे', 'मकामा']
+        )
+        self.assertEqual([result.correct for result in results], [True, False, False])
+        self.assertAlmostEqual(results[1].similarity, 6 / 11)
+        self.assertEqual(results[2].user, '')
+        self.assertEqual(results[2]['similarity'], 0.0)
+    
+    def test_accuracy(self):
+        results = TextProcessor.align_words(['धर्मक्षेत्रे', 'मामकाः', 'पाण्डवाश्चैव'], ['धर्मक्षत्रे', 'मकामा'])
+        summary = TextProcessor.summarize_results(results)
+        self.assertEqual(summary['accuracy'], 33.3)
+        self.assertEqual(TextProcessor.calculate_accuracy(results), 33.3)
+        self.assertEqual([result.original for result in summary['incorrect_words']], ['मामकाः', 'पाण्डवाश्चैव'])
+        self.assertGreater(AnalysisConfig.WORD_SIMILARITY_THRESHOLD, 6 / 11)
+    
+    def test_results_are_slotted_and_read_like_dicts(self):
+        result = TextProcessor.align_words(['धर्म'], ['धर्म'])[0]
+        self.assertFalse(hasattr(result, '__dict__'))
+        self.assertEqual(result['original'], 'धर्म')
+        self.assertEqual(result.get('slp1'), '')
+        self.assertIsNone(result.get('missing'))
+        with self.assertRaises(KeyError):
+            result['missing']
+
+
+class ConfusableSoundsTest(unittest.TestCase):
+    """FOLD_CONFUSABLE_SOUNDS decides whether b/v and vowel length count as errors"""
+    
+    ORIGINAL = ['बल', 'ईश']
+    SPOKEN = ['वल', 'इश']
+    
+    def test_vowel_length_graded_by_default(self):
+        self.assertFalse(AnalysisConfig.FOLD_CONFUSABLE_SOUNDS)
+        results = TextProcessor.align_words(self.ORIGINAL, self.SPOKEN)
+        self.assertEqual([result.correct for result in results], [False, False])
+        self.assertEqual([result.similarity for result in results], [0.5, 0.5])
+    
+    def test_folding_accepts_confusable_sounds(self):
+        with mock.patch.object(AnalysisConfig, 'FOLD_CONFUSABLE_SOUNDS', True):
+            results = TextProcessor.align_words(self.ORIGINAL, self.SPOKEN)
+        self.assertEqual([result.correct for result in results], [True, True])
+        self.assertEqual([result.similarity for result in results], [1.0, 1.0])
+        self.assertEqual(TextProcessor.phonetic_fold('बीजौ'), 'विजो')
+
+
+if __name__ == '__main__':
+    unittest.main()
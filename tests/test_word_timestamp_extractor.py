@@ -0,0 +1,34 @@
+"""
+Tests for locating a shloka word in Whisper's word timestamps.
+"""
+import unittest
+from difflib import SequenceMatcher
+
+from audio.word_timestamp_extractor import find_word_in_timestamps
+
+
+class FuzzyMatchTest(unittest.TestCase):
+    """The fuzzy pass scores candidates as ratio(target, word), like before the pruning"""
+    
+    def test_picks_the_most_similar_word(self):
+        words = [
+            {'word': 'धर्मक्षत्रे', 'start': 0.0, 'end': 0.8},
+            {'word': 'समवेता।', 'start': 0.8, 'end': 1.4},
+            {'word': 'युयुत्सव', 'start': 1.4, 'end': 2.0},
+        ]
+        self.assertEqual(find_word_in_timestamps('धर्मक्षेत्रे', words), {'start_time': 0.0, 'end_time': 0.8})
+    
+    def test_threshold_uses_the_target_first_ratio(self):
+        # ratio() is asymmetric for this pair: 0.5 with the target first, 0.25 reversed
+        target, spoken = 'cbcd', 'ddbd'
+        self.assertEqual(SequenceMatcher(None, target, spoken).ratio(), 0.5)
+        self.assertEqual(SequenceMatcher(None, spoken, target).ratio(), 0.25)
+        self.assertEqual(find_word_in_timestamps(target, [{'word': spoken, 'start': 1.0, 'end': 2.0}]),
+                         {'start_time': 1.0, 'end_time': 2.0})
+    
+    def test_no_close_word(self):
+        self.assertIsNone(find_word_in_timestamps('कुरुक्षेत्रे', [{'word': 'मामकाः', 'start': 0.0, 'end': 1.0}]))
+
+
+if __name__ == '__main__':
+    unittest.main()
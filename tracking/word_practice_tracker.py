@@ -3,6 +3,7 @@ Word Practice Tracker for Sanskrit Voice Bot v2
 Tracks user performance on word practice and provides intelligent suggestions.
 """
 import time
+from collections import deque
 from typing import Dict, Any
 
 import sys
@@ -12,6 +13,15 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from core.config import PracticeConfig
 
 
+# Fixed options appended to every suggestion message
+_SUGGESTION_OPTIONS = (
+    "🎯 Options:\n"
+    "1️⃣ Move to Next Shloka - Try different content\n"
+    "2️⃣ Alphabet Practice - Build fundamental skills\n"
+    "🔄 Keep Trying - Continue with this word"
+)
+
+
 class WordPracticeTracker:
     """
     Tracks word practice attempts and provides intelligent practice suggestions.
@@ -26,14 +36,28 @@ class WordPracticeTracker:
     def __init__(self):
         """Initialize the WordPracticeTracker"""
         self.word_attempts = {}  # Track attempts per word
-        self.session_start_time = time.time()
+        self._session_start_monotonic = time.monotonic()
+        self._reset_session_stats()
         self.max_attempts_before_suggestion = PracticeConfig.MAX_ATTEMPTS_BEFORE_SUGGESTION
         self.decreasing_accuracy_threshold = PracticeConfig.DECREASING_ACCURACY_THRESHOLD
     
     def reset_tracker(self):
         """Reset the tracker for a new practice session"""
         self.word_attempts = {}
-        self.session_start_time = time.time()
+        self._session_start_monotonic = time.monotonic()
+        self._reset_session_stats()
+    
+    def _reset_session_stats(self):
+        """Zero the running session totals kept up to date by record_word_attempt"""
+        self._total_attempts = 0
+        self._words_with_improvement = 0
+        self._words_needing_help = 0
+    
+    @staticmethod
+    def _word_flags(word_data: Dict[str, Any]):
+        """Return (improved, needs_help) for a word's current attempt history"""
+        improved = word_data['attempt_count'] >= 2 and word_data['last_accuracy'] > word_data['first_accuracy']
+        return improved, word_data['best_accuracy'] < 50
     
     def record_word_attempt(self, word_key: str, accuracy: float, user_transcription: str = ""):
         """
@@ -45,16 +69,24 @@ class WordPracticeTracker:
             user_transcription: What the user said
         """
         if word_key not in self.word_attempts:
+            window = PracticeConfig.WORD_HISTORY_WINDOW
             self.word_attempts[word_key] = {
-                'attempts': [],
-                'accuracies': [],
+                # Only the most recent attempts are kept; totals cover the whole session
+                'attempts': deque(maxlen=window),
+                'accuracies': deque(maxlen=window),
+                'transcriptions': deque(maxlen=window),
+                'attempt_count': 0,
+                'accuracy_sum': 0.0,
+                'first_accuracy': accuracy,
                 'last_accuracy': 0,
                 'decreasing_streak': 0,
-                'best_accuracy': 0,
-                'transcriptions': []
+                'best_accuracy': 0
             }
         
         word_data = self.word_attempts[word_key]
+        was_improved, needed_help = self._word_flags(word_data) if word_data['attempt_count'] else (False, False)
+        word_data['attempt_count'] += 1
+        word_data['accuracy_sum'] += accuracy
         word_data['attempts'].append(time.time())
         word_data['accuracies'].append(accuracy)
         word_data['transcriptions'].append(user_transcription)
@@ -67,6 +99,12 @@ class WordPracticeTracker:
         
         word_data['last_accuracy'] = accuracy
         word_data['best_accuracy'] = max(word_data['best_accuracy'], accuracy)
+        
+        # Keep session totals current so get_session_summary doesn't rescan every word
+        improved, needs_help = self._word_flags(word_data)
+        self._total_attempts += 1
+        self._words_with_improvement += improved - was_improved
+        self._words_needing_help += needs_help - needed_help
     
     def should_suggest_alphabet_practice(self, word_key: str) -> bool:
         """
@@ -82,7 +120,7 @@ class WordPracticeTracker:
             return False
         
         word_data = self.word_attempts[word_key]
-        attempt_count = len(word_data['attempts'])
+        attempt_count = word_data['attempt_count']
         
         # Suggest if user has made many attempts without improvement
         if attempt_count >= self.max_attempts_before_suggestion:
@@ -114,25 +152,22 @@ class WordPracticeTracker:
             return f"Let's practice the word '{word_text}' step by step."
         
         word_data = self.word_attempts[word_key]
-        attempt_count = len(word_data['attempts'])
+        attempt_count = word_data['attempt_count']
         best_accuracy = word_data['best_accuracy']
         last_accuracy = word_data['last_accuracy']
         
-        message = f"You've been working hard on the word '{word_text}'.\n\n"
+        parts = [f"You've been working hard on the word '{word_text}'.\n\n"]
         
         if attempt_count >= self.max_attempts_before_suggestion:
-            message += f"After {attempt_count} attempts (best: {best_accuracy:.1f}%), it might help to practice the individual sounds first.\n\n"
+            parts.append(f"After {attempt_count} attempts (best: {best_accuracy:.1f}%), it might help to practice the individual sounds first.\n\n")
         elif word_data['decreasing_streak'] >= self.decreasing_accuracy_threshold:
-            message += f"Your accuracy has been decreasing over the last {word_data['decreasing_streak']} attempts. Let's go back to basics.\n\n"
+            parts.append(f"Your accuracy has been decreasing over the last {word_data['decreasing_streak']} attempts. Let's go back to basics.\n\n")
         elif best_accuracy < 40:
-            message += f"This word seems challenging for you. Let's build up your foundation with alphabet practice.\n\n"
+            parts.append("This word seems challenging for you. Let's build up your foundation with alphabet practice.\n\n")
         
-        message += "🎯 Options:\n"
-        message += "1️⃣ Move to Next Shloka - Try different content\n"
-        message += "2️⃣ Alphabet Practice - Build fundamental skills\n"
-        message += "🔄 Keep Trying - Continue with this word"
+        parts.append(_SUGGESTION_OPTIONS)
         
-        return message
+        return ''.join(parts)
     
     def get_word_statistics(self, word_key: str) -> Dict[str, Any]:
         """
@@ -157,17 +192,22 @@ class WordPracticeTracker:
         accuracies = word_data['accuracies']
         
         # Calculate statistics
-        total_attempts = len(accuracies)
+        total_attempts = word_data['attempt_count']
         best_accuracy = word_data['best_accuracy']
         last_accuracy = word_data['last_accuracy']
-        average_accuracy = sum(accuracies) / len(accuracies) if accuracies else 0
+        accuracy_sum = word_data['accuracy_sum']
+        average_accuracy = accuracy_sum / total_attempts if total_attempts else 0
         
         # Determine improvement trend
         if total_attempts < 2:
             improvement_trend = 'insufficient_data'
-        elif len(accuracies) >= 3:
-            recent_avg = sum(accuracies[-3:]) / 3
-            earlier_avg = sum(accuracies[:-3]) / len(accuracies[:-3]) if len(accuracies) > 3 else accuracies[0]
+        elif total_attempts >= 3:
+            recent_sum = accuracies[-1] + accuracies[-2] + accuracies[-3]
+            recent_avg = recent_sum / 3
+            if total_attempts > 3:
+                earlier_avg = (accuracy_sum - recent_sum) / (total_attempts - 3)
+            else:
+                earlier_avg = word_data['first_accuracy']
             
             if recent_avg > earlier_avg + 5:
                 improvement_trend = 'improving'
@@ -195,28 +235,12 @@ class WordPracticeTracker:
             Dictionary containing session statistics
         """
         total_words_practiced = len(self.word_attempts)
-        total_attempts = sum(len(data['attempts']) for data in self.word_attempts.values())
-        session_duration = time.time() - self.session_start_time
-        
-        if total_words_practiced > 0:
-            words_with_improvement = 0
-            words_needing_help = 0
-            
-            for word_data in self.word_attempts.values():
-                if len(word_data['accuracies']) >= 2:
-                    if word_data['accuracies'][-1] > word_data['accuracies'][0]:
-                        words_with_improvement += 1
-                
-                if word_data['best_accuracy'] < 50:
-                    words_needing_help += 1
-        else:
-            words_with_improvement = 0
-            words_needing_help = 0
+        session_duration = time.monotonic() - self._session_start_monotonic
         
         return {
             'total_words_practiced': total_words_practiced,
-            'total_attempts': total_attempts,
+            'total_attempts': self._total_attempts,
             'session_duration_minutes': round(session_duration / 60, 1),
-            'words_with_improvement': words_with_improvement,
-            'words_needing_help': words_needing_help
+            'words_with_improvement': self._words_with_improvement,
+            'words_needing_help': self._words_needing_help
         }
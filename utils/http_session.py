@@ -0,0 +1,84 @@
+"""
+Shared HTTP Session for Sanskrit Voice Bot v2
+Keeps pooled keep-alive connections to the Groq API across requests.
+"""
+import atexit
+import threading
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+from core.config import AudioConfig
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Get or create the process-wide HTTP session.
+    
+    Reusing one session avoids a TLS handshake and DNS lookup on every
+    transcription request. Stale pooled connections and transient 429/5xx
+    replies are retried with backoff before the response is returned.
+    
+    Returns:
+        Shared requests.Session with a pooled adapter mounted
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # A pooled keep-alive socket the server closed while idle
+                # surfaces as a reset after the request was sent, which urllib3
+                # counts as a read error, so allow one read retry. The cost is
+                # that a read timeout re-sends the upload once. Retry-After is
+                # ignored so a long 429 delay cannot stall the Streamlit run;
+                # the exponential backoff stays small and bounded instead.
+                retries = Retry(
+                    total=AudioConfig.HTTP_MAX_RETRIES,
+                    read=1,
+                    backoff_factor=AudioConfig.HTTP_RETRY_BACKOFF,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset({'GET', 'POST'}),
+                    respect_retry_after_header=False,
+                    raise_on_status=False
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=AudioConfig.HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=AudioConfig.HTTP_POOL_MAXSIZE,
+                    max_retries=retries
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                atexit.register(session.close)
+                _session = session
+    return _session
+
+
+# The decoder is chosen once at import rather than on every response
+if HAS_ORJSON:
+    def response_json(response: requests.Response) -> Any:
+        """
+        Decode a JSON response body with orjson.
+        
+        Raises ValueError (like response.json()) when the body is not valid JSON.
+        """
+        return orjson.loads(response.content)
+else:
+    def response_json(response: requests.Response) -> Any:
+        """
+        Decode a JSON response body.
+        
+        Raises ValueError when the body is not valid JSON.
+        """
+        return response.json()
@@ -2,10 +2,55 @@
 Text Processing Utilities for Sanskrit Voice Bot v2
 Handles text normalization, word splitting, similarity calculations, and alignment.
 """
+import functools
 import re
+from dataclasses import dataclass
 from difflib import SequenceMatcher
 from typing import List, Dict, Any, Optional
 
+from core.config import AnalysisConfig
+
+# Sounds speech recognition confuses in Sanskrit, folded onto one canonical
+# form: ब/व, long/short इ and उ (and ॠ/ऋ), औ/ओ, both as vowels and as matras
+_PHONETIC_FOLD = str.maketrans({
+    'ब': 'व',
+    'ई': 'इ', 'ी': 'ि',
+    'ऊ': 'उ', 'ू': 'ु',
+    'ॠ': 'ऋ', 'ॄ': 'ृ',
+    'औ': 'ओ', 'ौ': 'ो'
+})
+
+# Anything other than Devanagari, whitespace and dandas separates words
+_NON_DEVANAGARI_RE = re.compile(r'[^\u0900-\u097F\s।॥]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Vowels (including anusvara/visarga marks) that close a syllable
+_SYLLABLE_VOWELS = frozenset('aeiouAEIOUāīūṛṝḷḹēōṁḥ')
+
+
+@dataclass
+class WordResult:
+    """Alignment result for one word position, readable like the dict it replaces"""
+    # Declared by hand: dataclass(slots=True) needs Python 3.10
+    __slots__ = ('index', 'original', 'user', 'correct', 'similarity', 'devanagari', 'slp1')
+    
+    index: int
+    original: str
+    user: str
+    correct: bool
+    similarity: float
+    devanagari: str
+    slp1: str
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
 
 class TextProcessor:
     """
@@ -34,12 +79,10 @@ class TextProcessor:
         
         # Remove punctuation and normalize spaces
         # Keep Sanskrit characters, spaces, and basic punctuation
-        text = re.sub(r'[^\u0900-\u097F\s।॥]', ' ', text)
+        text = _NON_DEVANAGARI_RE.sub(' ', text)
         
-        # Split by spaces and filter empty strings
-        words = [word.strip() for word in text.split() if word.strip()]
-        
-        return words
+        # Split by spaces (str.split already drops empty strings)
+        return text.split()
     
     @staticmethod
     def split_into_words(devanagari_text: str, slp1_text: str) -> List[Dict[str, Any]]:
@@ -72,6 +115,7 @@ class TextProcessor:
         return words
     
     @staticmethod
+    @functools.lru_cache(maxsize=4096)  # Learners retry the same words, so pairs repeat
     def calculate_similarity(text1: str, text2: str) -> float:
         """
         Calculate similarity between two strings using sequence matching.
@@ -85,9 +129,25 @@ class TextProcessor:
         """
         if not text1 or not text2:
             return 0.0
+        # Words read correctly need no sequence matching at all
+        if text1 == text2:
+            return 1.0
         
         return SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
     
+    @staticmethod
+    def phonetic_fold(text: str) -> str:
+        """
+        Map commonly confused Devanagari sounds onto a single form.
+        
+        Args:
+            text: Devanagari text
+            
+        Returns:
+            Text with each confusable sound replaced by its canonical form
+        """
+        return text.translate(_PHONETIC_FOLD)
+    
     @staticmethod
     def normalize_text(text: str) -> str:
         """
@@ -106,13 +166,13 @@ class TextProcessor:
         text = text.lower().strip()
         
         # Remove extra spaces
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         
         return text
     
     @staticmethod
     def align_words(original_words: List[str], user_words: List[str], 
-                   shloka_words_data: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+                   shloka_words_data: Optional[List[Dict[str, Any]]] = None) -> List[WordResult]:
         """
         Align words for better comparison using dynamic programming approach.
         
@@ -124,42 +184,68 @@ class TextProcessor:
         Returns:
             List of word alignment results
         """
-        from core.config import AnalysisConfig
-        
         results = []
-        max_length = max(len(original_words), len(user_words))
+        original_count = len(original_words)
+        user_count = len(user_words)
+        max_length = max(original_count, user_count)
+        # Looked up once rather than per word pair
+        threshold = AnalysisConfig.WORD_SIMILARITY_THRESHOLD
+        
+        # Score every position where both words exist in one batch
+        paired = [
+            i for i in range(min(original_count, user_count))
+            if original_words[i] and user_words[i]
+        ]
+        scores = dict(zip(paired, TextProcessor._pair_similarities(
+            [original_words[i] for i in paired],
+            [user_words[i] for i in paired]
+        )))
         
         for i in range(max_length):
-            original_word = original_words[i] if i < len(original_words) else ''
-            user_word = user_words[i] if i < len(user_words) else ''
+            original_word = original_words[i] if i < original_count else ''
+            user_word = user_words[i] if i < user_count else ''
             
-            # Calculate similarity if both words exist
-            if original_word and user_word:
-                similarity = TextProcessor.calculate_similarity(original_word, user_word)
-                is_correct = similarity > AnalysisConfig.WORD_SIMILARITY_THRESHOLD
-            else:
-                similarity = 0.0
-                is_correct = False
+            similarity = scores.get(i, 0.0)
+            is_correct = i in scores and similarity > threshold
             
             # Get corresponding word data if available
             word_data = None
             if shloka_words_data and i < len(shloka_words_data):
                 word_data = shloka_words_data[i]
             
-            results.append({
-                'index': i,
-                'original': original_word,
-                'user': user_word,
-                'correct': is_correct,
-                'similarity': similarity,
-                'devanagari': word_data['devanagari'] if word_data else original_word,
-                'slp1': word_data['slp1'] if word_data else ''
-            })
+            results.append(WordResult(
+                i,
+                original_word,
+                user_word,
+                is_correct,
+                similarity,
+                word_data['devanagari'] if word_data else original_word,
+                word_data['slp1'] if word_data else ''
+            ))
         
         return results
     
     @staticmethod
-    def extract_incorrect_words(word_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _pair_similarities(originals: List[str], users: List[str]) -> List[float]:
+        """
+        Score each (original, user) word pair with calculate_similarity's measure.
+        
+        Args:
+            originals: Original words
+            users: User words at the same positions
+            
+        Returns:
+            Similarity of each pair, in order
+        """
+        # Transcription mix-ups between confusable sounds are not counted as errors
+        if AnalysisConfig.FOLD_CONFUSABLE_SOUNDS:
+            originals = [word.translate(_PHONETIC_FOLD) for word in originals]
+            users = [word.translate(_PHONETIC_FOLD) for word in users]
+        
+        return list(map(TextProcessor.calculate_similarity, originals, users))
+    
+    @staticmethod
+    def extract_incorrect_words(word_results: List[WordResult]) -> List[WordResult]:
         """
         Extract words that need practice from alignment results.
         
@@ -169,10 +255,10 @@ class TextProcessor:
         Returns:
             List of incorrect word results
         """
-        return [result for result in word_results if not result['correct'] and result['original']]
+        return [result for result in word_results if not result.correct and result.original]
     
     @staticmethod
-    def calculate_accuracy(word_results: List[Dict[str, Any]]) -> float:
+    def calculate_accuracy(word_results: List[WordResult]) -> float:
         """
         Calculate overall accuracy from word results.
         
@@ -182,19 +268,57 @@ class TextProcessor:
         Returns:
             Accuracy percentage (0.0 to 100.0)
         """
-        if not word_results:
-            return 0.0
-        
         # Count words that exist in original (ignore empty placeholders)
-        original_words = [r for r in word_results if r['original']]
-        if not original_words:
+        total_count = 0
+        correct_count = 0
+        for result in word_results:
+            if result.original:
+                total_count += 1
+                correct_count += result.correct
+        if not total_count:
             return 0.0
         
-        correct_count = sum(1 for r in original_words if r['correct'])
-        accuracy = (correct_count / len(original_words)) * 100
+        accuracy = (correct_count / total_count) * 100
         
         return round(accuracy, 1)
     
+    @staticmethod
+    def summarize_results(word_results: List[WordResult]) -> Dict[str, Any]:
+        """
+        Score alignment results in a single pass.
+        
+        Gives the same accuracy and incorrect words as calculate_accuracy and
+        extract_incorrect_words, without walking the results once per metric.
+        
+        Args:
+            word_results: List of word alignment results
+            
+        Returns:
+            Dictionary with accuracy, correct_count, total_count and incorrect_words
+        """
+        correct_count = 0
+        total_count = 0
+        incorrect_words = []
+        
+        for result in word_results:
+            # Ignore empty placeholders for extra user words
+            if not result.original:
+                continue
+            total_count += 1
+            if result.correct:
+                correct_count += 1
+            else:
+                incorrect_words.append(result)
+        
+        accuracy = round((correct_count / total_count) * 100, 1) if total_count else 0.0
+        
+        return {
+            'accuracy': accuracy,
+            'correct_count': correct_count,
+            'total_count': total_count,
+            'incorrect_words': incorrect_words
+        }
+    
     @staticmethod
     def generate_pronunciation_guide(word_data: Dict[str, Any]) -> str:
         """
@@ -234,11 +358,9 @@ class TextProcessor:
         syllables = []
         current_syllable = ""
         
-        vowels = set('aeiouAEIOUāīūṛṝḷḹēōṁḥ')
-        
         for char in text:
             current_syllable += char
-            if char in vowels:
+            if char in _SYLLABLE_VOWELS:
                 syllables.append(current_syllable)
                 current_syllable = ""
         